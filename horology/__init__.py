@@ -1,6 +1,52 @@
 __author__ = 'Maciej J Mikulski'
 __version__ = '1.4.2'
 
-from horology.timed_context import Timing
-from horology.timed_decorator import timed
-from horology.timed_iterable import Timed
+_TYPE_CHECKING = False  # avoids importing typing
+
+if _TYPE_CHECKING:
+    from horology.cost_model import CostModel
+    from horology.import_profiler import ImportProfiler
+    from horology.instrumentation import Instrumentation, instrument
+    from horology.outliers import OutlierDetector
+    from horology.phases import PhaseStats
+    from horology.stats import Stats
+    from horology.timed_context import Timing
+    from horology.timed_decorator import timed
+    from horology.timed_executor import TimedExecutor
+    from horology.timed_iterable import Timed
+    from horology.timed_map import TimedMap
+    from horology.tracing import TraceRecorder
+
+# Submodules are imported on the first access to their objects, so that
+# importing horology adds as little as possible to the startup time.
+_LAZY_IMPORTS = {
+    'CostModel': 'horology.cost_model',
+    'ImportProfiler': 'horology.import_profiler',
+    'Instrumentation': 'horology.instrumentation',
+    'instrument': 'horology.instrumentation',
+    'OutlierDetector': 'horology.outliers',
+    'PhaseStats': 'horology.phases',
+    'Stats': 'horology.stats',
+    'Timing': 'horology.timed_context',
+    'timed': 'horology.timed_decorator',
+    'TimedExecutor': 'horology.timed_executor',
+    'Timed': 'horology.timed_iterable',
+    'TimedMap': 'horology.timed_map',
+    'TraceRecorder': 'horology.tracing',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> object:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    from importlib import import_module
+    value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
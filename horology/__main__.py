@@ -0,0 +1,53 @@
+"""Command line interface of horology
+
+Usage:
+    python -m horology importtime [options] script.py [args ...]
+    python -m horology importtime [options] -m module [args ...]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import runpy
+import sys
+
+from horology.import_profiler import ImportProfiler
+from horology.tformatter import UNITS
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m horology')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importtime = commands.add_parser(
+        'importtime',
+        help='run a program and print a tree of times of its imports')
+    importtime.add_argument('-m', dest='is_module', action='store_true',
+                            help='run library module as a script')
+    importtime.add_argument('--min-ms', type=float, default=0.,
+                            help='omit modules imported faster than this')
+    importtime.add_argument('--unit', default='auto',
+                            choices=['auto'] + [u.name for u in UNITS],
+                            help='time unit, by default adjusted automatically')
+    importtime.add_argument('target', help='script path or module name')
+    importtime.add_argument('args', nargs=argparse.REMAINDER,
+                            help='arguments passed to the program')
+
+    args = parser.parse_args(argv)
+
+    profiler = ImportProfiler(unit=args.unit, min_interval=args.min_ms / 1000,
+                              print_fn=lambda s: print(s, file=sys.stderr))
+    sys.argv = [args.target, *args.args]
+    # runpy imports these on the first run, they are not a part of the program.
+    import pkgutil  # noqa: F401
+    import weakref  # noqa: F401
+    with profiler:
+        if args.is_module:
+            runpy.run_module(args.target, run_name='__main__', alter_sys=True)
+        else:
+            sys.path[0] = os.path.dirname(os.path.abspath(args.target))
+            runpy.run_path(args.target, run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
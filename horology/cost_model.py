@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from _thread import allocate_lock
+from math import exp, isnan, log, nan
+
+from horology.tformatter import UnitType, rescale_time
+
+
+class _OnlineRegression:
+    """Least squares fit of y = intercept + slope * x, updated online"""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean_x = 0.
+        self.mean_y = 0.
+        self._m2_x = 0.  # sum of squared deviations of x
+        self._c_xy = 0.  # sum of products of deviations of x and y
+
+    def add(self, x: float, y: float) -> None:
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        self.mean_y += (y - self.mean_y) / self.n
+        self._m2_x += dx * (x - self.mean_x)
+        self._c_xy += dx * (y - self.mean_y)
+
+    @property
+    def slope(self) -> float:
+        return self._c_xy / self._m2_x if self._m2_x > 0 else nan
+
+    @property
+    def intercept(self) -> float:
+        return self.mean_y - self.slope * self.mean_x
+
+
+class CostModel:
+    """Fits time of calls against their size, online
+
+    Two models are fitted with least squares, using constant memory:
+    a linear one, `time = intercept + slope * size`, and a power law,
+    `time = coefficient * size ** exponent`, fitted on logarithms of
+    sizes and times. The exponent tells the scaling of the measured
+    code, e.g. about 1 for O(n) and about 2 for O(n^2). Calls can be
+    added from many threads.
+
+    Attributes
+    ----------
+    num_calls: int
+        How many times were added.
+
+    Examples
+    --------
+    >>> model = CostModel()
+    >>> for n in [10, 100, 1000]:
+    ...     model.add(n, 2e-6 * n ** 2)
+    >>> round(model.exponent, 3), round(model.coefficient, 9)
+    (2.0, 2e-06)
+
+    """
+
+    def __init__(self) -> None:
+        self._linear = _OnlineRegression()
+        self._power = _OnlineRegression()
+        # `threading.Lock` is the same, but importing `threading` is slow.
+        self._lock = allocate_lock()
+
+    def add(self, size: float, interval: float) -> None:
+        """Add the time of a call with the given size
+
+        Non-positive sizes and times are skipped by the power law.
+
+        """
+        with self._lock:
+            self._linear.add(size, interval)
+            if size > 0 and interval > 0:
+                self._power.add(log(size), log(interval))
+
+    @property
+    def num_calls(self) -> int:
+        return self._linear.n
+
+    @property
+    def intercept(self) -> float:
+        return self._linear.intercept
+
+    @property
+    def slope(self) -> float:
+        return self._linear.slope
+
+    @property
+    def exponent(self) -> float:
+        return self._power.slope
+
+    @property
+    def coefficient(self) -> float:
+        intercept = self._power.intercept
+        return nan if isnan(intercept) else exp(intercept)
+
+    def summary(self, unit: UnitType = 'auto') -> str:
+        """Return both fits as two lines"""
+        if isnan(self.slope):
+            return 'cost model: not enough different sizes'
+
+        t_intercept, u_intercept = rescale_time(abs(self.intercept), unit)
+        t_slope, u_slope = rescale_time(abs(self.slope), unit)
+        sign = '-' if self.slope < 0 else '+'
+        print_str = f'linear fit: time = {"-" if self.intercept < 0 else ""}' \
+                    f'{t_intercept:.3g} {u_intercept} {sign} {t_slope:.3g} {u_slope} * size'
+        if not isnan(self.exponent):
+            print_str += f'\nlog-log fit: time ~ size^{self.exponent:.3g}'
+        return print_str
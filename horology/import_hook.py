@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class ImportHook:
+    """Base class of meta path finders that wrap loading of modules
+
+    The hook does not find modules itself. It asks the other finders in
+    `sys.meta_path` and replaces the loader of the found spec with a
+    proxy that calls `create_module` and `exec_module` of the hook.
+    Subclasses override these methods and `wants`.
+
+    Loaders seen by the loaded modules, e.g. `module.__loader__`, are
+    the original ones.
+
+    """
+
+    def __init__(self) -> None:
+        self._searching: set[str] = set()
+
+    def install(self) -> None:
+        """Insert the hook at the beginning of `sys.meta_path`"""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)  # type: ignore[arg-type]
+
+    def uninstall(self) -> None:
+        """Remove the hook from `sys.meta_path`"""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)  # type: ignore[arg-type]
+
+    def wants(self, fullname: str) -> bool:
+        """Whether the module with `fullname` should be hooked"""
+        return True
+
+    def create_module(self, loader: Any, spec: Any) -> ModuleType | None:
+        create_module = getattr(loader, 'create_module', None)
+        return create_module(spec) if create_module is not None else None
+
+    def exec_module(self, loader: Any, module: ModuleType) -> None:
+        loader.exec_module(module)
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        if fullname in self._searching:
+            return None  # called back by another finder that delegates
+        if not self.wants(fullname):
+            return None
+
+        self._searching.add(fullname)
+        try:
+            spec = self._find_spec_elsewhere(fullname, path, target)
+        finally:
+            self._searching.discard(fullname)
+
+        if spec is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _HookedLoader(spec.loader, self)
+        return spec
+
+    def _find_spec_elsewhere(self, fullname: str, path: Any, target: Any) -> Any:
+        for finder in sys.meta_path:
+            if finder is not self and hasattr(finder, 'find_spec'):
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    return spec
+        return None
+
+
+class _HookedLoader:
+    """Loader that delegates to `loader` through `hook`"""
+
+    def __init__(self, loader: Any, hook: ImportHook) -> None:
+        self.loader = loader
+        self.hook = hook
+
+    def create_module(self, spec: Any) -> ModuleType | None:
+        return self.hook.create_module(self.loader, spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # Let the module see its real loader, e.g. for resources.
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        self.hook.exec_module(self.loader, module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from time import perf_counter as counter
+from types import ModuleType, TracebackType
+from typing import Any, Callable, Literal, Type
+
+from horology.import_hook import ImportHook
+from horology.tformatter import UnitType, rescale_time
+
+
+class ImportNode:
+    """Module in the tree of imports
+
+    Attributes
+    ----------
+    name: str
+        Full name of the module.
+    interval: float
+        Time of importing the module, including its nested imports, in
+        seconds.
+    children: list of ImportNode
+        Modules imported while importing this one, in order of import.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.interval = 0.
+        self.children: list[ImportNode] = []
+        self._start = 0.
+
+    @property
+    def self_interval(self) -> float:
+        """Time of importing the module without its nested imports"""
+        return self.interval - sum(c.interval for c in self.children)
+
+
+class ImportProfiler(ImportHook):
+    """Measures time of importing each module with nested imports
+
+    While active, the profiler hooks into the import system and builds a
+    tree of modules being imported for the first time. The time of a
+    module covers creating and executing it, and thus its nested
+    imports. Finding the module is not included. Modules imported before
+    the profiler was started are not reported.
+
+    Parameters
+    ----------
+    unit: str, optional
+        Time unit used to print elapsed time. Possible values are:
+         ['ns', 'us', 'ms', 's', 'min', 'h', 'd']. Use 'a' or 'auto'
+         for automatic time adjustment (default).
+    min_interval: float, optional
+        Modules imported faster than this, in seconds, are omitted from
+        the printed tree together with their nested imports.
+    print_fn: Callable or None, optional
+        Function that is called to print the tree when leaving the
+        context. Use `None` to disable printing. By default, the
+        built-in `print` function is used.
+
+    Attributes
+    ----------
+    roots: list of ImportNode
+        Modules imported directly from the profiled code.
+
+    Example
+    -------
+    Basic usage
+        ```
+        from horology import ImportProfiler
+        with ImportProfiler(min_interval=0.001):
+            import my_cli
+        ```
+        Possible result:
+        ```
+        my_cli: 48.1 ms (self 1.2 ms)
+          requests: 40.2 ms (self 3.1 ms)
+            urllib3: 20.3 ms
+            charset_normalizer: 12.5 ms
+          my_cli.config: 5.4 ms
+
+        total 87 modules in 48.1 ms
+        ```
+
+    From the command line, for any program
+        ```
+        python -m horology importtime my_script.py --its --args
+        python -m horology importtime -m my_package.cli --its --args
+        ```
+    """
+
+    def __init__(
+            self,
+            *,
+            unit: UnitType = 'auto',
+            min_interval: float = 0.,
+            print_fn: Callable[..., Any] | None = print
+    ) -> None:
+        super().__init__()
+        self.unit = unit
+        self.min_interval = min_interval
+        self.print_fn = print_fn or (lambda _: None)
+
+        self.roots: list[ImportNode] = []
+        self.num_modules = 0
+        self._stack: list[ImportNode] = []
+
+    def create_module(self, loader: Any, spec: Any) -> ModuleType | None:
+        node = ImportNode(spec.name)
+        self.num_modules += 1
+        (self._stack[-1].children if self._stack else self.roots).append(node)
+        self._stack.append(node)
+        node._start = counter()
+        try:
+            return super().create_module(loader, spec)
+        except BaseException:
+            self._finish(node)
+            raise
+
+    def exec_module(self, loader: Any, module: ModuleType) -> None:
+        node = next((n for n in reversed(self._stack) if n.name == module.__name__), None)
+        try:
+            super().exec_module(loader, module)
+        finally:
+            if node is not None:
+                self._finish(node)
+
+    def print_summary(self) -> None:
+        """Print the tree of imports with their times"""
+        lines: list[str] = []
+        for root in self.roots:
+            self._format(root, 0, lines)
+        total = sum(r.interval for r in self.roots)
+        t, u = rescale_time(total, self.unit)
+        if lines:
+            lines.append('')
+        lines.append(f'total {self.num_modules} modules in {t:.3g} {u}')
+        self.print_fn('\n'.join(lines))
+
+    def __enter__(self) -> ImportProfiler:
+        self.install()
+        return self
+
+    def __exit__(
+            self,
+            exc_type: Type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> Literal[False]:
+        self.uninstall()
+        self.print_summary()
+        return False
+
+    def _finish(self, node: ImportNode) -> None:
+        node.interval = counter() - node._start
+        # Drop also nodes of modules that were never executed.
+        while self._stack:
+            if self._stack.pop() is node:
+                break
+
+    def _format(self, node: ImportNode, depth: int, lines: list[str]) -> None:
+        if node.interval < self.min_interval:
+            return
+        t, u = rescale_time(node.interval, self.unit)
+        line = f'{"  " * depth}{node.name}: {t:.3g} {u}'
+        if node.children:
+            t_self, u_self = rescale_time(node.self_interval, self.unit)
+            line += f' (self {t_self:.3g} {u_self})'
+        lines.append(line)
+        for child in node.children:
+            self._format(child, depth + 1, lines)
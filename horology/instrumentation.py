@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import inspect
+from fnmatch import fnmatchcase
+from types import ModuleType, TracebackType
+from typing import Any, Callable, Literal, Type
+
+from horology.import_hook import ImportHook
+from horology.stats import Stats
+from horology.tformatter import UnitType
+from horology.timed_decorator import timed
+
+# Dunder methods that are worth timing. Others are called implicitly
+# so often that timing them would mostly measure the overhead.
+_TIMED_DUNDERS = ('__init__', '__call__')
+
+
+class Instrumentation:
+    """Times all functions of classes and modules without editing them
+
+    Functions and methods are replaced with their `timed` versions that
+    aggregate statistics silently by default. Call `uninstrument` (or
+    exit the context) to restore the original functions.
+
+    Only references that are looked up after instrumenting are timed,
+    e.g. a function imported with `from module import function` before
+    `instrument(module)` is not timed. Coroutine and generator
+    functions are skipped, because `timed` would measure only their
+    creation.
+
+    Parameters
+    ----------
+    unit: str, optional
+        Time unit used to print elapsed time. Possible values are:
+         ['ns', 'us', 'ms', 's', 'min', 'h', 'd']. Use 'a' or 'auto'
+         for automatic time adjustment (default).
+    print_fn: Callable or None, optional
+        Function that is called to print time of each call of each
+        instrumented function. By default, it is `None` and nothing is
+        printed.
+    summary_print_fn: Callable or None, optional
+        Function that is called to print the summary on `uninstrument`.
+        Use `None` to disable printing. By default, the built-in
+        `print` function is used.
+
+    Attributes
+    ----------
+    stats: dict
+        Maps qualified names of instrumented functions to their `Stats`.
+
+    Example
+    -------
+    Profile a third-party package under real load
+        ```
+        import requests
+        from horology import instrument
+
+        with instrument(requests.sessions, requests.adapters):
+            run_server()
+        ```
+        Possible result:
+        ```
+        requests.sessions.Session.request: 120 calls in 14.2 s, min/mean/max: 31.4/118/980 ms
+        requests.adapters.HTTPAdapter.send: 120 calls in 13.9 s, min/mean/max: 30.1/116/975 ms
+        ...
+        ```
+    """
+
+    def __init__(
+            self,
+            *,
+            unit: UnitType = 'auto',
+            print_fn: Callable[..., Any] | None = None,
+            summary_print_fn: Callable[..., Any] | None = print
+    ) -> None:
+        self.unit = unit
+        self.print_fn = print_fn
+        self.summary_print_fn = summary_print_fn or (lambda _: None)
+
+        self.stats: dict[str, Stats] = {}
+        self._patched: list[tuple[Any, str, Any]] = []
+        # Maps ids of original functions to their wrappers, so that
+        # aliases of a function share its wrapper and statistics.
+        self._wrappers: dict[int, Callable[..., Any]] = {}
+        self._hook: _InstrumentingHook | None = None
+
+    def add(self, target: type | ModuleType) -> None:
+        """Instrument all methods of a class or functions of a module
+
+        For modules, methods of classes defined in them are instrumented
+        as well.
+
+        """
+        if isinstance(target, ModuleType):
+            self._add_module(target)
+        elif isinstance(target, type):
+            self._add_class(target)
+        else:
+            raise TypeError(f'Only classes and modules can be instrumented, '
+                            f'got {type(target).__name__}.')
+
+    def add_import_hook(self, pattern: str) -> None:
+        """Instrument modules matching `pattern` when they are imported
+
+        Parameters
+        ----------
+        pattern: str
+            Shell-style pattern of full module names, e.g. 'requests.*'.
+            Modules already imported are not affected, use `add` for
+            them.
+
+        """
+        if self._hook is None:
+            self._hook = _InstrumentingHook(self)
+            self._hook.install()
+        self._hook.patterns.append(pattern)
+
+    def uninstrument(self) -> None:
+        """Restore the original functions and remove the import hook"""
+        if self._hook is not None:
+            self._hook.uninstall()
+            self._hook = None
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched.clear()
+        self._wrappers.clear()
+        self.print_summary()
+
+    def print_summary(self) -> None:
+        """Print statistics of all functions that were called
+
+        Functions are sorted by the total time, starting from the
+        longest.
+
+        """
+        lines = []
+        by_total = sorted(self.stats.items(), key=lambda x: x[1].total, reverse=True)
+        for name, s in by_total:
+            if s.num_intervals == 0:
+                continue
+            lines.append(f'{name}: {s.brief(self.unit)}')
+
+        self.summary_print_fn('\n'.join(lines) if lines else 'no calls')
+
+    def __enter__(self) -> Instrumentation:
+        return self
+
+    def __exit__(
+            self,
+            exc_type: Type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> Literal[False]:
+        self.uninstrument()
+        return False
+
+    def _add_module(self, module: ModuleType) -> None:
+        for attr, obj in list(vars(module).items()):
+            if getattr(obj, '__module__', None) != module.__name__:
+                continue  # imported from elsewhere
+            if inspect.isfunction(obj):
+                self._patch(module, attr, obj)
+            elif isinstance(obj, type):
+                self._add_class(obj)
+
+    def _add_class(self, cls: type) -> None:
+        for attr, obj in list(vars(cls).items()):
+            if attr.startswith('__') and attr.endswith('__') and attr not in _TIMED_DUNDERS:
+                continue
+            if isinstance(obj, (staticmethod, classmethod)):
+                self._patch(cls, attr, obj.__func__, type(obj))
+            elif inspect.isfunction(obj):
+                self._patch(cls, attr, obj)
+
+    def _patch(
+            self,
+            owner: Any,
+            attr: str,
+            f: Callable[..., Any],
+            method_type: type | None = None
+    ) -> None:
+        if isinstance(getattr(f, 'stats', None), Stats):
+            return  # already instrumented
+        if (inspect.iscoroutinefunction(f) or inspect.isgeneratorfunction(f)
+                or inspect.isasyncgenfunction(f)):
+            return
+
+        wrapped = self._wrappers.get(id(f))
+        if wrapped is None:
+            name = f'{f.__module__}.{f.__qualname__}'
+            timed_f = timed(name=name + ': ', unit=self.unit, print_fn=self.print_fn,
+                            aggregate=True)(f)
+            assert timed_f.stats is not None
+            self.stats[name] = timed_f.stats
+            wrapped = self._wrappers[id(f)] = timed_f
+
+        original = vars(owner)[attr]
+        setattr(owner, attr, method_type(wrapped) if method_type else wrapped)
+        self._patched.append((owner, attr, original))
+
+
+class _InstrumentingHook(ImportHook):
+    """Import hook that instruments matching modules after execution"""
+
+    def __init__(self, instrumentation: Instrumentation) -> None:
+        super().__init__()
+        self.instrumentation = instrumentation
+        self.patterns: list[str] = []
+
+    def wants(self, fullname: str) -> bool:
+        return any(fnmatchcase(fullname, p) for p in self.patterns)
+
+    def exec_module(self, loader: Any, module: ModuleType) -> None:
+        loader.exec_module(module)
+        self.instrumentation.add(module)
+
+
+def instrument(
+        *targets: type | ModuleType,
+        imports: str | None = None,
+        unit: UnitType = 'auto',
+        print_fn: Callable[..., Any] | None = None,
+        summary_print_fn: Callable[..., Any] | None = print
+) -> Instrumentation:
+    """Time all methods of classes and functions of modules
+
+    Parameters
+    ----------
+    targets: class or module
+        Classes and modules that should be instrumented.
+    imports: str or None, optional
+        Shell-style pattern of names of modules that should be
+        instrumented when they are imported, e.g. 'mypackage.*'.
+    unit, print_fn, summary_print_fn
+        See `Instrumentation`.
+
+    Returns
+    -------
+    Instrumentation
+        Object that holds the statistics. Use it as a context manager or
+        call its `uninstrument` method to restore the original code and
+        print the summary.
+
+    Examples
+    --------
+    >>> import json
+    >>> with instrument(json, summary_print_fn=None) as ins:
+    ...     _ = json.dumps([1, 2, 3])
+    >>> ins.stats['json.dumps'].num_intervals
+    1
+
+    """
+    instrumentation = Instrumentation(unit=unit, print_fn=print_fn,
+                                      summary_print_fn=summary_print_fn)
+    for target in targets:
+        instrumentation.add(target)
+    if imports is not None:
+        instrumentation.add_import_hook(imports)
+    return instrumentation
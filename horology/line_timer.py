@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import sys
+from collections import defaultdict
+from threading import get_ident
+from time import perf_counter as counter
+from types import CodeType, FrameType
+from typing import Any, Callable
+
+_TOOL_NAME = 'horology'
+
+
+class LineTimer:
+    """Attributes time spent in a code object to its individual lines
+
+    On Python 3.12+ the low-overhead `sys.monitoring` API is used, and
+    only the events of the measured code object are enabled. They are
+    enabled on the first `start` and stay enabled until `close`, so
+    that the code object is not instrumented again for every run. If
+    the API is not available or the profiler tool id is already taken
+    (e.g. by `cProfile`), `sys.settrace` is used instead.
+
+    Time spent in functions called from a line is attributed to that
+    line. Only the thread that called `start` is measured.
+
+    Parameters
+    ----------
+    code: CodeType
+        Code object, e.g. `f.__code__`, whose lines should be timed.
+
+    Attributes
+    ----------
+    intervals: dict
+        Maps line numbers to the time spent in them during the last run
+        between `start` and `stop`, in seconds.
+    total_intervals: dict
+        Maps line numbers to the time spent in them during all runs, in
+        seconds.
+
+    Examples
+    --------
+    >>> def foo():
+    ...     return sum(range(1000))
+    >>> lt = LineTimer(foo.__code__)
+    >>> lt.start()
+    >>> _ = foo()
+    >>> lt.stop()
+    >>> lt.close()
+    >>> list(lt.intervals) == [foo.__code__.co_firstlineno + 1]
+    True
+
+    """
+
+    def __init__(self, code: CodeType) -> None:
+        self.code = code
+        self.intervals: dict[int, float] = defaultdict(float)
+        self.total_intervals: dict[int, float] = defaultdict(float)
+
+        self._thread: int | None = None
+        self._line: int | None = None
+        self._last = 0.
+        self._active = False
+        self._monitoring = False  # whether `sys.monitoring` events are enabled
+        self._prev_trace: Callable[..., Any] | None = None
+
+    def start(self) -> None:
+        self.intervals.clear()
+        self._line = None
+        self._thread = get_ident()
+        if not self._monitoring:
+            self._monitoring = self._start_monitoring()
+        if not self._monitoring:
+            self._prev_trace = sys.gettrace()
+            sys.settrace(self._trace_call)
+        self._active = True
+
+    def stop(self) -> None:
+        self._record(None)
+        self._active = False
+        if not self._monitoring:
+            sys.settrace(self._prev_trace)
+            self._prev_trace = None
+        for line, interval in self.intervals.items():
+            self.total_intervals[line] += interval
+
+    def close(self) -> None:
+        """Disable `sys.monitoring` events and free the profiler tool id"""
+        if self._monitoring:
+            self._stop_monitoring()
+            self._monitoring = False
+
+    def hottest(self, n: int, total: bool = False) -> list[tuple[int, float]]:
+        """Return `n` lines with the biggest time as (line, seconds)
+
+        Times of the last run are used, or of all runs if `total` is set.
+
+        """
+        intervals = self.total_intervals if total else self.intervals
+        return sorted(intervals.items(), key=lambda x: x[1], reverse=True)[:n]
+
+    def source(self, line: int) -> str:
+        """Return the stripped source code of the given line"""
+        import linecache
+        return linecache.getline(self.code.co_filename, line).strip()
+
+    def _record(self, line: int | None) -> None:
+        now = counter()
+        if self._line is not None:
+            self.intervals[self._line] += now - self._last
+        self._line = line
+        # Exclude the time of this bookkeeping from the next line.
+        self._last = counter()
+
+    def _start_monitoring(self) -> bool:
+        monitoring = getattr(sys, 'monitoring', None)
+        if monitoring is None:
+            return False
+        try:
+            monitoring.use_tool_id(monitoring.PROFILER_ID, _TOOL_NAME)
+        except ValueError:  # the profiler id is in use
+            return False
+        monitoring.register_callback(monitoring.PROFILER_ID,
+                                     monitoring.events.LINE, self._on_line)
+        monitoring.set_local_events(monitoring.PROFILER_ID, self.code,
+                                    monitoring.events.LINE)
+        return True
+
+    def _stop_monitoring(self) -> None:
+        monitoring = sys.monitoring  # type: ignore[attr-defined]
+        monitoring.set_local_events(monitoring.PROFILER_ID, self.code, 0)
+        monitoring.register_callback(monitoring.PROFILER_ID,
+                                     monitoring.events.LINE, None)
+        monitoring.free_tool_id(monitoring.PROFILER_ID)
+
+    def _on_line(self, code: CodeType, line: int) -> None:
+        if self._active and get_ident() == self._thread:
+            self._record(line)
+
+    def _trace_call(self, frame: FrameType, event: str, arg: Any) -> Any:
+        if frame.f_code is self.code:
+            return self._trace_line
+        if self._prev_trace is not None:
+            return self._prev_trace(frame, event, arg)
+        return None
+
+    def _trace_line(self, frame: FrameType, event: str, arg: Any) -> Any:
+        if event == 'line':
+            self._record(frame.f_lineno)
+        return self._trace_line
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+
+class OutlierDetector:
+    """Streaming detector of unusually long time intervals
+
+    The detector keeps exponentially weighted moving averages of the
+    intervals and of their absolute deviations. After `warmup`
+    intervals, an interval is an outlier if it exceeds the average by
+    more than `threshold` deviations and is at least `min_ratio` times
+    longer than the average. Outliers are clipped before they update
+    the averages, so that a burst of slow cases does not hide the next
+    ones. Memory and time used per interval are constant.
+
+    Parameters
+    ----------
+    threshold: float, optional
+        How many average absolute deviations above the average an
+        interval must be to be considered an outlier.
+    min_ratio: float, optional
+        How many times longer than the average an interval must be to
+        be considered an outlier. Prevents reporting tiny jitter of
+        very stable intervals.
+    alpha: float, optional
+        Weight of a new interval in the moving averages. Smaller values
+        give longer memory.
+    warmup: int, optional
+        Number of first intervals that are never considered outliers.
+
+    Examples
+    --------
+    >>> is_outlier = OutlierDetector(warmup=3)
+    >>> [is_outlier(x) for x in [0.1, 0.11, 0.09, 0.1, 1.2, 0.1]]
+    [False, False, False, False, True, False]
+
+    """
+
+    def __init__(
+            self,
+            threshold: float = 5.,
+            *,
+            min_ratio: float = 2.,
+            alpha: float = 0.05,
+            warmup: int = 10
+    ) -> None:
+        self.threshold = threshold
+        self.min_ratio = min_ratio
+        self.alpha = alpha
+        self.warmup = warmup
+
+        self.mean = 0.
+        self.deviation = 0.
+        self.num_intervals = 0
+
+    def __call__(self, interval: float) -> bool:
+        """Update the statistics and check if `interval` is an outlier"""
+        self.num_intervals += 1
+        if self.num_intervals == 1:
+            self.mean = interval
+            return False
+
+        limit = max(self.mean + self.threshold * self.deviation,
+                    self.mean * self.min_ratio)
+        is_outlier = self.num_intervals > self.warmup and interval > limit
+        if is_outlier:
+            interval = limit
+
+        # Plain running averages until there is enough data for alpha.
+        alpha = max(self.alpha, 1 / self.num_intervals)
+        self.deviation += alpha * (abs(interval - self.mean) - self.deviation)
+        self.mean += alpha * (interval - self.mean)
+        return is_outlier
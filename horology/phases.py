@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from horology.stats import Stats
+from horology.tformatter import UnitType, rescale_time
+
+# Name of the phase from the last lap until the end of the context.
+REST = '(rest)'
+
+
+class PhaseStats:
+    """Statistics of phases aggregated over many invocations
+
+    Percentiles of phases are estimated from a random sample of their
+    times, so the memory used does not grow with the number of
+    invocations.
+
+    Parameters
+    ----------
+    sample_size: int, optional
+        How many times of each phase are kept to estimate percentiles.
+        Default 1000.
+
+    Attributes
+    ----------
+    totals: Stats
+        Statistics of total times of the invocations.
+    phases: dict
+        Maps names of phases to their `Stats`, in order of their first
+        appearance.
+
+    Examples
+    --------
+    >>> ps = PhaseStats()
+    >>> ps.add({'parse': 0.001, 'query': 0.004}, 0.005)
+    >>> ps.add({'parse': 0.003, 'query': 0.012}, 0.015)
+    >>> print(ps.summary('ms'))
+    2 calls in 20 ms, min/mean/max: 5/10/15 ms
+      parse: 20% of total, mean 2 ms, p50/p90/p99: 2/2.8/2.98 ms
+      query: 80% of total, mean 8 ms, p50/p90/p99: 8/11.2/11.9 ms
+
+    """
+
+    def __init__(self, sample_size: int = 1000) -> None:
+        self.sample_size = sample_size
+        self.totals = Stats()
+        self.phases: dict[str, Stats] = {}
+
+    def add(self, laps: dict[str, float], total: float) -> None:
+        """Add times of phases and the total time of one invocation"""
+        self.totals.add(total)
+        for phase, interval in laps.items():
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases.setdefault(phase, Stats(sample_size=self.sample_size))
+            stats.add(interval)
+
+    def summary(self, unit: UnitType = 'auto') -> str:
+        """Return statistics of totals and of each phase"""
+        print_str = self.totals.brief(unit)
+        for phase, s in self.phases.items():
+            share = s.total / self.totals.total if self.totals.total else 0
+            t_mean, u = rescale_time(s.mean, unit)
+            t_50, t_90, t_99 = (rescale_time(p, u)[0] for p in s.percentiles(50, 90, 99))
+            print_str += f'\n  {phase}: {share:.0%} of total, mean {t_mean:.3g} {u}, ' \
+                         f'p50/p90/p99: {t_50:.3g}/{t_90:.3g}/{t_99:.3g} {u}'
+        return print_str
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from _thread import allocate_lock
+from math import inf, sqrt
+
+from horology.tformatter import UnitType, rescale_time
+
+
+class Stats:
+    """Running statistics of time intervals
+
+    Uses constant memory and time per interval, unless
+    `keep_intervals` is set. Intervals can be added from many threads.
+
+    Parameters
+    ----------
+    keep_intervals: bool, optional
+        Whether all intervals should be stored in the `intervals` list,
+        e.g. to compute median or percentiles later.
+    sample_size: int or None, optional
+        If given, only a uniform random sample of at most `sample_size`
+        intervals is stored in `intervals` (reservoir sampling), so the
+        memory used is bounded. Median and percentiles are then
+        estimated from the sample. Implies `keep_intervals`.
+
+    Attributes
+    ----------
+    num_intervals: int
+        How many intervals were added.
+    total: float
+        Sum of all intervals in seconds.
+    min: float
+        The shortest interval in seconds.
+    max: float
+        The longest interval in seconds.
+    intervals: list of float
+        All intervals in seconds, or their sample if `sample_size` is
+        given. Empty unless `keep_intervals` or `sample_size` is set.
+
+    Examples
+    --------
+    >>> s = Stats()
+    >>> for x in [0.1, 0.2, 0.3]:
+    ...     s.add(x)
+    >>> s.num_intervals, round(s.mean, 3), round(s.std, 3), s.max
+    (3, 0.2, 0.1, 0.3)
+
+    >>> s = Stats(keep_intervals=True)
+    >>> for x in [0.4, 0.1, 0.2, 0.3]:
+    ...     s.add(x)
+    >>> round(s.median, 3), round(s.percentile(90), 3)
+    (0.25, 0.37)
+    >>> print(s.summary('ms'))
+    min/median/max: 100/250/400 ms
+    average (std): 250 (129) ms
+
+    """
+
+    def __init__(self, keep_intervals: bool = False, sample_size: int | None = None) -> None:
+        self.num_intervals = 0
+        self.total = 0.
+        self.min = inf
+        self.max = -inf
+        self.intervals: list[float] = []
+        self.sample_size = sample_size
+        self._keep_intervals = keep_intervals or sample_size is not None
+        if sample_size is not None:
+            from random import randrange  # not needed, and slow to import, otherwise
+            self._randrange = randrange
+        self._m2 = 0.  # sum of squared deviations, see Welford's method
+        # `threading.Lock` is the same, but importing `threading` is slow.
+        self._lock = allocate_lock()
+
+    def add(self, interval: float) -> None:
+        """Update the statistics with a new interval"""
+        with self._lock:
+            n = self.num_intervals
+            total = self.total
+            delta = interval - (total / n if n else 0.)
+            n += 1
+            total += interval
+            self._m2 += delta * (interval - total / n)
+            self.num_intervals = n
+            self.total = total
+            if interval < self.min:
+                self.min = interval
+            if interval > self.max:
+                self.max = interval
+            if self.sample_size is not None and n > self.sample_size:
+                i = self._randrange(n)
+                if i < self.sample_size:
+                    self.intervals[i] = interval
+            elif self._keep_intervals:
+                self.intervals.append(interval)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.num_intervals if self.num_intervals else 0.
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, 0 if less than 2 intervals"""
+        if self.num_intervals < 2:
+            return 0.
+        return sqrt(max(self._m2, 0.) / (self.num_intervals - 1))
+
+    @property
+    def median(self) -> float:
+        return self.percentile(50)
+
+    def percentile(self, q: float) -> float:
+        """Return the `q`-th percentile, with linear interpolation
+
+        Requires `keep_intervals` or `sample_size`.
+
+        """
+        return self.percentiles(q)[0]
+
+    def percentiles(self, *qs: float) -> list[float]:
+        """Return percentiles for each of `qs`, sorting intervals once
+
+        Requires `keep_intervals` or `sample_size`.
+
+        """
+        if not self._keep_intervals:
+            raise RuntimeError('Percentiles require `keep_intervals` or `sample_size`.')
+        if not self.intervals:
+            return [0.] * len(qs)
+        ordered = sorted(self.intervals)
+        result = []
+        for q in qs:
+            position = (len(ordered) - 1) * q / 100
+            lower = int(position)
+            upper = min(lower + 1, len(ordered) - 1)
+            result.append(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+        return result
+
+    def brief(self, unit: UnitType = 'auto', noun: str = 'calls') -> str:
+        """Return number, total, min, mean and max in one line"""
+        t_total, u_total = rescale_time(self.total, unit)
+        t_mean, u = rescale_time(self.mean, unit)
+        t_min, _ = rescale_time(self.min, u)
+        t_max, _ = rescale_time(self.max, u)
+        return f'{self.num_intervals} {noun} in {t_total:.3g} {u_total}, ' \
+               f'min/mean/max: {t_min:.3g}/{t_mean:.3g}/{t_max:.3g} {u}'
+
+    def summary(self, unit: UnitType = 'auto', prefix: str = '') -> str:
+        """Return min, median, max, average and std as two lines
+
+        The format is the same as in the summary of `Timed`. Without
+        `keep_intervals` or `sample_size`, the median is skipped. Each
+        line starts with `prefix`.
+
+        """
+        if self._keep_intervals:
+            t_median, u = rescale_time(self.median, unit)
+        else:
+            t_median, u = rescale_time(self.mean, unit)
+        # For clarity, all values are shown using the same unit.
+        t_min, _ = rescale_time(self.min, u)
+        t_max, _ = rescale_time(self.max, u)
+        t_mean, _ = rescale_time(self.mean, u)
+        t_std, _ = rescale_time(self.std, u)
+
+        if self._keep_intervals:
+            first = f'min/median/max: {t_min:.3g}/{t_median:.3g}/{t_max:.3g} {u}'
+        else:
+            first = f'min/max: {t_min:.3g}/{t_max:.3g} {u}'
+        return f'{prefix}{first}\n{prefix}average (std): {t_mean:.3g} ({t_std:.3g}) {u}'
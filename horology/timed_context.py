@@ -2,15 +2,18 @@ from __future__ import annotations
 
 from time import perf_counter as counter
 from types import TracebackType
-from typing import Any, Callable, Literal, Type
+from typing import Any, Callable, ClassVar, Literal, Type
 
+from horology import tracing
+from horology.phases import REST, PhaseStats
 from horology.tformatter import UnitType, rescale_time
 
 
 class Timing:
     """Context manager that measures time elapsed with the context
 
-    Use `interval` property to get the time elapsed.
+    Use `interval` property to get the time elapsed, and `lap` method
+    to mark ends of phases within the context.
 
     Parameters
     ----------
@@ -26,6 +29,32 @@ class Timing:
         context. Use `None` to disable printing anything. You can
         provide e.g. `logger.info`. By default, the built-in `print`
         function is used.
+    budget: float or None, optional
+        Expected maximal time in seconds. If the context takes longer,
+        ' (over budget)' is appended to the printed time and
+        `on_over_budget` is called.
+    on_over_budget: Callable or None, optional
+        Function that is called with the time elapsed and the name, when
+        the context exits after its `budget`.
+    watchdog: bool, optional
+        Whether a shared watchdog thread should report the context still
+        running after its `budget`, together with the current stack.
+        The report is printed with `stall_print_fn`. Requires `budget`.
+    stall_print_fn: Callable or None, optional
+        Function that is called by the watchdog to print the report of
+        the stalled context. By default, `print_fn` is used. One of them
+        is required by `watchdog`.
+
+    Attributes
+    ----------
+    laps: dict
+        Maps names of phases marked with `lap` to their times in seconds
+        in the last invocation. Time from the last lap until leaving the
+        context is stored as '(rest)'.
+    phase_stats: dict
+        Class attribute that maps names of contexts in which `lap` was
+        used to their `PhaseStats`, aggregated over all invocations.
+        Use `reset_phase_stats` to clear it.
 
     Example
     -------
@@ -39,21 +68,74 @@ class Timing:
         ```
         Important calculations: 12.4 s
         ```
+
+    Detect stalls while they happen
+        ```
+        with Timing(name='Handling request: ', budget=0.2, watchdog=True):
+            handle(request)
+        ```
+        Possible result, if `handle` hangs:
+        ```
+        Handling request: still running after 200 ms, budget 200 ms exceeded
+          File "server.py", line 12, in <module>
+            handle(request)
+          ...
+        ```
+
+    Break down time of a request handler into phases
+        ```
+        for request in requests:
+            with Timing(name='Request: ', print_fn=None) as t:
+                query = parse(request)
+                t.lap('parse')
+                rows = run(query)
+                t.lap('query')
+                render(rows)
+                t.lap('render')
+        Timing.print_phase_summary()
+        ```
+        Possible result:
+        ```
+        Request: 1000 calls in 12.3 s, min/mean/max: 8.12/12.3/51.2 ms
+          parse: 10% of total, mean 1.23 ms, p50/p90/p99: 1.1/1.52/2.1 ms
+          query: 75% of total, mean 9.22 ms, p50/p90/p99: 7.92/14.1/44.3 ms
+          render: 15% of total, mean 1.85 ms, p50/p90/p99: 1.8/2.01/2.53 ms
+          (rest): 0% of total, mean 310 ns, p50/p90/p99: 300/330/510 ns
+        ```
     """
 
+    phase_stats: ClassVar[dict[str, PhaseStats]] = {}
+
     def __init__(
             self,
             name: str | None = None,
             *,
             unit: UnitType = 'auto',
-            print_fn: Callable[..., Any] | None = print
+            print_fn: Callable[..., Any] | None = print,
+            budget: float | None = None,
+            on_over_budget: Callable[[float, str], Any] | None = None,
+            watchdog: bool = False,
+            stall_print_fn: Callable[..., Any] | None = None
     ) -> None:
+        if watchdog and budget is None:
+            raise ValueError('`watchdog` requires `budget`.')
+        stall_print_fn = print_fn if stall_print_fn is None else stall_print_fn
+        if watchdog and stall_print_fn is None:
+            raise ValueError('`watchdog` requires `print_fn` or `stall_print_fn`.')
+
         self.name = name if name else ""
         self.unit = unit
+        self.budget = budget
+        self.on_over_budget = on_over_budget
         self._print_fn = print_fn
+        self._watchdog = watchdog
+        self._stall_print_fn = stall_print_fn
+        self._watch_token: int | None = None
 
         self._start: float | None = None
         self._interval: float | None = None
+        self._last_lap = 0.
+        self.laps: dict[str, float] = {}
 
     @property
     def interval(self) -> float:
@@ -74,9 +156,83 @@ class Timing:
             return counter() - self._start
 
     def __enter__(self) -> Timing:
+        if self._watchdog and self.budget is not None and self._stall_print_fn is not None:
+            from horology.watchdog import shared_watchdog
+            self._watch_token = shared_watchdog.watch(self.name, self.budget,
+                                                      self._stall_print_fn, self.unit)
+        self._interval = None
+        self.laps = {}
         self._start = counter()
+        self._last_lap = self._start
         return self
 
+    def lap(self, phase: str) -> float:
+        """Mark the end of a phase that started at the previous lap
+
+        Parameters
+        ----------
+        phase: str
+            Name of the phase. Times of phases with the same name are
+            summed.
+
+        Returns
+        -------
+        float
+            Time of the phase in seconds.
+
+        """
+        if self._start is None or self._interval is not None:
+            raise RuntimeError('`lap` can be called only inside the context.')
+
+        now = counter()
+        interval = now - self._last_lap
+        self.laps[phase] = self.laps.get(phase, 0.) + interval
+        if (recorder := tracing.recorder) is not None:
+            recorder.add(phase, self._last_lap, now, 'Timing')
+        self._last_lap = now
+        return interval
+
+    @classmethod
+    def print_phase_summary(
+            cls,
+            name: str | None = None,
+            *,
+            unit: UnitType = 'auto',
+            print_fn: Callable[..., Any] = print
+    ) -> None:
+        """Print statistics of phases aggregated over all invocations
+
+        Parameters
+        ----------
+        name: str or None, optional
+            Name of the context to be reported. By default, all contexts
+            in which `lap` was used are reported.
+        unit: str, optional
+            Time unit used to print elapsed time.
+        print_fn: Callable, optional
+            Function that is called to print the summary. By default,
+            the built-in `print` function is used.
+
+        """
+        names = list(cls.phase_stats) if name is None else [name]
+        print_fn('\n'.join(f'{n}{cls.phase_stats[n].summary(unit)}' for n in names))
+
+    @classmethod
+    def reset_phase_stats(cls, name: str | None = None) -> None:
+        """Forget statistics of phases aggregated so far
+
+        Parameters
+        ----------
+        name: str or None, optional
+            Name of the context which statistics should be removed. By
+            default, statistics of all contexts are removed.
+
+        """
+        if name is None:
+            cls.phase_stats.clear()
+        else:
+            cls.phase_stats.pop(name, None)
+
     def __exit__(
             self,
             exc_type: Type[BaseException] | None,
@@ -84,10 +240,28 @@ class Timing:
             exc_tb: TracebackType | None,
     ) -> Literal[False]:
         self._interval = self.interval
+        if self.laps and self._start is not None:
+            self.laps[REST] = self._start + self._interval - self._last_lap
+            phase_stats = self.phase_stats.get(self.name)
+            if phase_stats is None:
+                phase_stats = self.phase_stats.setdefault(self.name, PhaseStats())
+            phase_stats.add(self.laps, self._interval)
+        if self._watch_token is not None:
+            from horology.watchdog import shared_watchdog
+            shared_watchdog.unwatch(self._watch_token)
+            self._watch_token = None
+        over_budget = self.budget is not None and self._interval > self.budget
+        if over_budget and self.on_over_budget is not None:
+            self.on_over_budget(self._interval, self.name)
+        if (recorder := tracing.recorder) is not None and self._start is not None:
+            recorder.add(self.name.strip(' :') or 'Timing', self._start,
+                         self._start + self._interval, 'Timing')
         t, u = rescale_time(self.interval, self.unit)
         if self._print_fn is not None:
             print_str = f'{self.name}{t:.3g} {u}'
             if exc_type is not None:
                 print_str += ' (failed)'
+            if over_budget:
+                print_str += ' (over budget)'
             self._print_fn(print_str)
         return False
@@ -1,7 +1,11 @@
 from functools import wraps
 from time import perf_counter as counter
-from typing import Any, Callable, ParamSpec, Protocol, overload
+from typing import Any, Callable, Hashable, ParamSpec, Protocol, overload
 
+from horology import tracing
+from horology.cost_model import CostModel
+from horology.outliers import OutlierDetector
+from horology.stats import Stats
 from horology.tformatter import UnitType, rescale_time
 
 P = ParamSpec('P')
@@ -15,8 +19,15 @@ class CallableWithInterval(Protocol[P]):
     [PEP 612](https://peps.python.org/pep-0612/)
     """
     interval: float
+    line_intervals: dict[int, float]
+    stats: Stats | None
+    buckets: dict[Hashable, Stats]
+    cost_model: CostModel | None
+    print_summary: Callable[..., None]
     __call__: Callable[P, Any]
     __name__: str
+    __qualname__: str
+    __wrapped__: Callable[P, Any]
 
 
 @overload
@@ -28,7 +39,17 @@ def timed(
         *,
         name: str | None = None,
         unit: UnitType = 'auto',
-        print_fn: Callable[..., Any] | None = print
+        print_fn: Callable[..., Any] | None = print,
+        lines: int = 0,
+        on_outlier: Callable[[float, tuple, dict], Any] | None = None,
+        outlier_detector: Callable[[float], bool] | None = None,
+        aggregate: bool = False,
+        budget: float | None = None,
+        on_over_budget: Callable[[float, tuple, dict], Any] | None = None,
+        watchdog: bool = False,
+        stall_print_fn: Callable[..., Any] | None = None,
+        key: Callable[..., Hashable] | None = None,
+        size: Callable[..., float] | None = None
 ) -> Callable[[Callable[P, Any]], CallableWithInterval[P]]: ...  # Decorator with arguments
 
 
@@ -37,7 +58,17 @@ def timed(
         *,
         name: str | None = None,
         unit: UnitType = 'auto',
-        print_fn: Callable[..., Any] | None = print):
+        print_fn: Callable[..., Any] | None = print,
+        lines: int = 0,
+        on_outlier: Callable[[float, tuple, dict], Any] | None = None,
+        outlier_detector: Callable[[float], bool] | None = None,
+        aggregate: bool = False,
+        budget: float | None = None,
+        on_over_budget: Callable[[float, tuple, dict], Any] | None = None,
+        watchdog: bool = False,
+        stall_print_fn: Callable[..., Any] | None = None,
+        key: Callable[..., Hashable] | None = None,
+        size: Callable[..., float] | None = None):
     """Decorator that prints time of execution of the decorated function
 
     Parameters
@@ -55,12 +86,75 @@ def timed(
         Function that is called to print the time elapsed. Use `None` to
         disable printing anything. You can provide e.g. `logger.info`.
         By default, the built-in `print` function is used.
+    lines: int, optional
+        Number of the hottest lines of `f` to be printed after the time
+        of each call, and for all calls together by `print_summary`.
+        Time of each line is measured with `sys.monitoring` (Python
+        3.12+) or `sys.settrace`. With `sys.monitoring`, the code of `f`
+        is instrumented on the first call and stays instrumented, which
+        keeps the profiler tool id taken, e.g. from `cProfile`. Default
+        0 disables measuring time of lines.
+    on_outlier: Callable or None, optional
+        Function that is called after an unusually long call of `f` with
+        its time in seconds, and the positional and keyword arguments of
+        that call. Use it to log or capture only the slow calls, e.g.
+        with `print_fn=None`. By default, outliers are not detected.
+    outlier_detector: Callable or None, optional
+        Function that is called with the time of each call and returns
+        True for outliers. By default, `OutlierDetector()` is used if
+        `on_outlier` is provided.
+    aggregate: bool, optional
+        Whether statistics of all calls should be collected in the
+        `stats` attribute. Combined with `print_fn=None` gives a silent
+        mode with low overhead.
+    budget: float or None, optional
+        Expected maximal time of a call in seconds. If a call takes
+        longer, ' (over budget)' is appended to the printed time and
+        `on_over_budget` is called.
+    on_over_budget: Callable or None, optional
+        Function that is called after a call longer than `budget` with
+        its time in seconds, and the positional and keyword arguments of
+        that call.
+    watchdog: bool, optional
+        Whether a shared watchdog thread should report calls still
+        running after their `budget`, together with the current stack.
+        The report is printed with `stall_print_fn`. Requires `budget`.
+    stall_print_fn: Callable or None, optional
+        Function that is called by the watchdog to print the report of
+        a stalled call. By default, `print_fn` is used. One of them is
+        required by `watchdog`.
+    key: Callable or None, optional
+        Function that is called with the arguments of each call and
+        returns the bucket, e.g. a size class of the input. Statistics
+        of calls are collected separately for each bucket. It is called
+        before `f`, so `f` may modify its arguments.
+    size: Callable or None, optional
+        Function that is called with the arguments of each call and
+        returns its numeric size, e.g. the length of the input. A cost
+        model of time against size is fitted, see `CostModel`. It is
+        called before `f`, like `key`.
 
     Attributes
     ----------
     interval: float
         Time elapsed by the function in seconds. Can be used to get the
         time programmatically after the execution of f.
+    line_intervals: dict
+        Maps line numbers of `f` to the time spent in them during all
+        calls, in seconds. Empty unless `lines` > 0.
+    stats: Stats or None
+        Number, total, min, max, mean and std of times of all calls if
+        `aggregate` is set, otherwise None.
+    buckets: dict
+        Maps buckets to `Stats` of calls. Empty unless `key` is
+        provided.
+    cost_model: CostModel or None
+        Linear and log-log fits of times of calls against their size if
+        `size` is provided, otherwise None.
+    print_summary: Callable
+        Prints `stats`, the hottest lines, `buckets` and `cost_model`,
+        whichever are collected. Takes the function used for printing as an optional
+        argument, by default `print`.
 
     Returns
     -------
@@ -103,38 +197,240 @@ def timed(
         print(qux.interval)
         ```
 
+    Find the hottest lines
+        ```
+        @timed(lines=2)
+        def quux():
+            a = [i ** 2 for i in range(10 ** 6)]
+            return sum(a)
+        quux()
+        ```
+        Possible result:
+        ```
+        quux: 62.4 ms
+          line   3: 58.1 ms (93%)  a = [i ** 2 for i in range(10 ** 6)]
+          line   4: 4.22 ms (7%)  return sum(a)
+        ```
+
+    Report only unusually slow calls
+        ```
+        def report(interval, args, kwargs):
+            logger.warning(f'process{args} took {interval:.3g} s')
+
+        @timed(print_fn=None, on_outlier=report)
+        def process(batch):
+            ...
+        ```
+
+    Check how time depends on the size of the input
+        ```
+        @timed(print_fn=None, key=lambda batch: len(batch) // 100 * 100,
+               size=lambda batch: len(batch))
+        def process(batch):
+            ...
+        for batch in batches:
+            process(batch)
+        process.print_summary()
+        ```
+        Possible result:
+        ```
+        process:
+          0: 312 calls in 1.01 s, min/mean/max: 0.812/3.24/9.12 ms
+          100: 97 calls in 1.86 s, min/mean/max: 11.2/19.2/35 ms
+          linear fit: time = 1.1 ms + 135 us * size
+          log-log fit: time ~ size^1.98
+        ```
     """
 
+    if watchdog and budget is None:
+        raise ValueError('`watchdog` requires `budget`.')
+    stall_print_fn = print_fn if stall_print_fn is None else stall_print_fn
+    if watchdog and stall_print_fn is None:
+        raise ValueError('`watchdog` requires `print_fn` or `stall_print_fn`.')
+
     def decorator(_f):
-        @wraps(_f)
-        def wrapped(*args, **kwargs):
-            start = counter()
-            exception = None
-            try:
-                return_value = _f(*args, **kwargs)
-            except Exception as e:
-                exception = e
-            finally:
-                interval = counter() - start
-                wrapped.interval = interval
-
-            if print_fn is not None:
+        if lines and not hasattr(_f, '__code__'):
+            raise TypeError(f'Cannot time lines of {_f!r}, it has no code object.')
+        line_timer = None
+        if lines:
+            from horology.line_timer import LineTimer
+            line_timer = LineTimer(_f.__code__)
+
+        is_outlier = outlier_detector
+        if on_outlier is not None and is_outlier is None:
+            is_outlier = OutlierDetector()
+
+        stats = Stats() if aggregate else None
+        buckets: dict[Hashable, Stats] = {}
+        cost_model = CostModel() if size is not None else None
+
+        if watchdog:
+            from horology.watchdog import shared_watchdog
+
+        per_call = lines or on_outlier is not None or budget is not None \
+            or key is not None or size is not None
+
+        if not per_call and stats is None:
+            wrapped = _plain_wrapper(_f, name, unit, print_fn)
+        elif not per_call and print_fn is None:
+            wrapped = _aggregate_wrapper(_f, stats)
+        else:
+            @wraps(_f)
+            def wrapped(*args, **kwargs):
                 nonlocal name
                 name = _f.__name__ + ': ' if name is None else name
-                t, u = rescale_time(interval, unit=unit)
-                print_str = f'{name}{t:.3g} {u}'
+                bucket = key(*args, **kwargs) if key is not None else None
+                call_size = size(*args, **kwargs) if size is not None else None
+                watch_token = None
+                if watchdog:
+                    watch_token = shared_watchdog.watch(name, budget, stall_print_fn, unit)
+                start = counter()
+                exception = None
+                try:
+                    if line_timer is not None:
+                        line_timer.start()
+                    return_value = _f(*args, **kwargs)
+                except Exception as e:
+                    exception = e
+                finally:
+                    if line_timer is not None:
+                        line_timer.stop()
+                    interval = counter() - start
+                    wrapped.interval = interval
+                    if watch_token is not None:
+                        shared_watchdog.unwatch(watch_token)
+                    if stats is not None:
+                        stats.add(interval)
+                    if key is not None:
+                        bucket_stats = buckets.get(bucket)
+                        if bucket_stats is None:
+                            bucket_stats = buckets.setdefault(bucket, Stats())
+                        bucket_stats.add(interval)
+                    if cost_model is not None:
+                        cost_model.add(call_size, interval)
+                    if (recorder := tracing.recorder) is not None:
+                        recorder.add(_f.__qualname__, start, start + interval, 'timed')
+
+                if on_outlier is not None and is_outlier(interval):
+                    on_outlier(interval, args, kwargs)
+
+                over_budget = budget is not None and interval > budget
+                if over_budget and on_over_budget is not None:
+                    on_over_budget(interval, args, kwargs)
+
+                if print_fn is not None:
+                    t, u = rescale_time(interval, unit=unit)
+                    print_str = f'{name}{t:.3g} {u}'
+                    if exception is not None:
+                        print_str += ' (failed)'
+                    if over_budget:
+                        print_str += ' (over budget)'
+                    if line_timer is not None:
+                        for line, line_interval in line_timer.hottest(lines):
+                            t, u = rescale_time(line_interval, unit=unit)
+                            share = line_interval / interval if interval else 0
+                            print_str += f'\n  line {line:4}: {t:.3g} {u} ({share:.0%})' \
+                                         f'  {line_timer.source(line)}'
+                    print_fn(print_str)
+
                 if exception is not None:
-                    print_str += ' (failed)'
-                print_fn(print_str)
+                    raise exception
 
-            if exception is not None:
-                raise exception
+                return return_value
 
-            return return_value
+        def print_summary(summary_print_fn: Callable[..., Any] = print) -> None:
+            _name = _f.__name__ + ': ' if name is None else name
+            if stats is not None:
+                print_str = f'{_name}{stats.brief(unit)}'
+            else:
+                print_str = _name.rstrip()
+            try:
+                ordered = sorted(buckets.items())
+            except TypeError:  # buckets cannot be compared
+                ordered = list(buckets.items())
+            if line_timer is not None:
+                lines_total = sum(line_timer.total_intervals.values())
+                for line, line_interval in line_timer.hottest(lines, total=True):
+                    t, u = rescale_time(line_interval, unit=unit)
+                    share = line_interval / lines_total if lines_total else 0
+                    print_str += f'\n  line {line:4}: {t:.3g} {u} ({share:.0%})' \
+                                 f'  {line_timer.source(line)}'
+            for bucket, bucket_stats in ordered:
+                print_str += f'\n  {bucket}: {bucket_stats.brief(unit)}'
+            if cost_model is not None:
+                print_str += '\n  ' + cost_model.summary(unit).replace('\n', '\n  ')
+            summary_print_fn(print_str)
 
+        wrapped.print_summary = print_summary
+        wrapped.line_intervals = line_timer.total_intervals if line_timer is not None else {}
+        wrapped.stats = stats
+        wrapped.buckets = buckets
+        wrapped.cost_model = cost_model
         return wrapped
 
     if f is None:  # used with ()
         return decorator
     else:  # used without ()
         return decorator(f)
+
+
+def _plain_wrapper(f, name, unit, print_fn):
+    """Wrap `f` for `timed` used without any per-call features
+
+    Avoids the checks of the full wrapper, so that the overhead of the
+    basic usage stays minimal.
+
+    """
+
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        start = counter()
+        exception = None
+        try:
+            return_value = f(*args, **kwargs)
+        except Exception as e:
+            exception = e
+        finally:
+            interval = counter() - start
+            wrapped.interval = interval
+            if (recorder := tracing.recorder) is not None:
+                recorder.add(f.__qualname__, start, start + interval, 'timed')
+
+        if print_fn is not None:
+            nonlocal name
+            name = f.__name__ + ': ' if name is None else name
+            t, u = rescale_time(interval, unit=unit)
+            print_str = f'{name}{t:.3g} {u}'
+            if exception is not None:
+                print_str += ' (failed)'
+            print_fn(print_str)
+
+        if exception is not None:
+            raise exception
+
+        return return_value
+
+    return wrapped
+
+
+def _aggregate_wrapper(f, stats):
+    """Wrap `f` for `timed` that only aggregates statistics silently
+
+    This is the mode used by `Instrumentation`, where the overhead adds
+    up over all calls of all instrumented functions.
+
+    """
+
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        start = counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            interval = counter() - start
+            wrapped.interval = interval
+            stats.add(interval)
+            if (recorder := tracing.recorder) is not None:
+                recorder.add(f.__qualname__, start, start + interval, 'timed')
+
+    return wrapped
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future
+from functools import partial
+from threading import Lock
+from time import perf_counter as counter
+from typing import Any, Callable
+
+from horology.stats import Stats
+from horology.tformatter import UnitType, rescale_time
+
+
+class TimedExecutor(Executor):
+    """Wrapper to an executor that measures queue wait and run time
+
+    For each submitted task, the time between submitting it and the
+    start of its execution in a worker (queue wait) is measured
+    separately from the time of the execution itself (run time).
+    Statistics of both, together with utilisation of the workers and
+    the longest queue, are printed when the executor is shut down, e.g.
+    when leaving the `with` block.
+
+    Medians are estimated from a random sample of at most `sample_size`
+    tasks, so the memory used does not grow with the number of tasks.
+
+    Works with `ThreadPoolExecutor` and `ProcessPoolExecutor`. For the
+    latter, start and end of a task are measured in the worker process
+    with `perf_counter`, which is system-wide on Linux, macOS and
+    Windows.
+
+    Parameters
+    ----------
+    executor: Executor
+        Executor that runs the tasks.
+    max_workers: int or None, optional
+        Number of workers of `executor`, used to compute utilisation
+        and queue length. By default, it is read from standard
+        executors.
+    unit: str, optional
+        Time unit used to print elapsed time. Possible values are:
+         ['ns', 'us', 'ms', 's', 'min', 'h', 'd']. Use 'a' or 'auto'
+         for automatic time adjustment (default).
+    print_fn: Callable or None, optional
+        Function that is called after each task to print its queue wait
+        and run time. By default, it is `None` and nothing is printed.
+    summary_print_fn: Callable or None, optional
+        Function that is called to print the summary on shutdown. Use
+        `None` to disable printing. By default, the built-in `print`
+        function is used.
+    sample_size: int, optional
+        How many queue waits and run times are kept to estimate the
+        medians. Default 10 000.
+
+    Attributes
+    ----------
+    queue_stats: Stats
+        Statistics of times between submitting and starting tasks.
+    run_stats: Stats
+        Statistics of times of running tasks.
+    max_queue_length: int
+        The biggest number of tasks that were waiting for a free worker
+        at the moment of submitting a task.
+
+    Example
+    -------
+    Basic usage
+        ```
+        from concurrent.futures import ThreadPoolExecutor
+        from horology import TimedExecutor
+
+        with TimedExecutor(ThreadPoolExecutor(4)) as executor:
+            results = list(executor.map(download, urls))
+        ```
+        Possible result:
+        ```
+        total 100 tasks in 5.12 s
+        queue wait min/median/max: 0.0121/2.51/4.98 s
+        queue wait average (std): 2.5 (1.45) s
+        run min/median/max: 0.101/0.204/0.412 s
+        run average (std): 0.205 (0.0601) s
+        worker utilisation: 99% of 4 workers, max queue length 95
+        ```
+    """
+
+    def __init__(
+            self,
+            executor: Executor,
+            *,
+            max_workers: int | None = None,
+            unit: UnitType = 'auto',
+            print_fn: Callable[..., Any] | None = None,
+            summary_print_fn: Callable[..., Any] | None = print,
+            sample_size: int = 10_000
+    ) -> None:
+        self.executor = executor
+        self.max_workers = max_workers or getattr(executor, '_max_workers', None)
+        self.unit = unit
+        self.print_fn = print_fn
+        self.summary_print_fn = summary_print_fn or (lambda _: None)
+
+        self.queue_stats = Stats(sample_size=sample_size)
+        self.run_stats = Stats(sample_size=sample_size)
+        self.num_submitted = 0
+        self.max_queue_length = 0
+
+        self._lock = Lock()
+        self._first_submit: float | None = None
+        self._last_end: float | None = None
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        submitted = counter()
+        with self._lock:
+            if self._first_submit is None:
+                self._first_submit = submitted
+            self.num_submitted += 1
+            if self.max_workers is not None:
+                waiting = self.num_submitted - self.run_stats.num_intervals - self.max_workers
+                self.max_queue_length = max(self.max_queue_length, waiting)
+
+        inner = self.executor.submit(TimedCall(fn, args, kwargs))
+        outer = _TimedFuture(inner)
+        inner.add_done_callback(partial(self._done, outer, submitted, fn))
+        return outer
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        if wait:
+            self.print_summary()
+
+    def print_summary(self) -> None:
+        """Print statistics of queue wait and run time of tasks
+
+        It is called automatically on shutdown.
+
+        """
+        n = self.run_stats.num_intervals
+        if n == 0:
+            self.summary_print_fn('no tasks')
+            return
+
+        total = self._last_end - self._first_submit  # type: ignore[operator]
+        t_total, u_total = rescale_time(total, self.unit)
+        print_str = f'total {n} tasks in {t_total:.3g} {u_total}\n'
+        print_str += self.queue_stats.summary(self.unit, prefix='queue wait ') + '\n'
+        print_str += self.run_stats.summary(self.unit, prefix='run ')
+        if self.max_workers is not None and total > 0:
+            utilisation = self.run_stats.total / (self.max_workers * total)
+            print_str += f'\nworker utilisation: {utilisation:.0%} of {self.max_workers} workers, ' \
+                         f'max queue length {self.max_queue_length}'
+        self.summary_print_fn(print_str)
+
+    def _done(self, outer: Future, submitted: float, fn: Callable[..., Any], inner: Future) -> None:
+        if inner.cancelled():
+            outer.cancel()
+            return
+        if inner.exception() is not None:  # failure of the executor, e.g. a broken pool
+            if outer.set_running_or_notify_cancel():
+                outer.set_exception(inner.exception())
+            return
+
+        start, end, result, exception = inner.result()
+        with self._lock:
+            self.queue_stats.add(start - submitted)
+            self.run_stats.add(end - start)
+            self._last_end = end if self._last_end is None else max(self._last_end, end)
+
+        if self.print_fn is not None:
+            t_queue, u_queue = rescale_time(start - submitted, self.unit)
+            t_run, u_run = rescale_time(end - start, self.unit)
+            name = getattr(fn, '__name__', repr(fn))
+            print_str = f'{name}: queued {t_queue:.3g} {u_queue}, ran {t_run:.3g} {u_run}'
+            if exception is not None:
+                print_str += ' (failed)'
+            self.print_fn(print_str)
+
+        if outer.set_running_or_notify_cancel():
+            if exception is not None:
+                outer.set_exception(exception)
+            else:
+                outer.set_result(result)
+
+
+class _TimedFuture(Future):
+    """Future of the result of a task, that follows the future of the
+    underlying executor
+
+    The underlying future returns also start and end of the task, and
+    is resolved first. This one is resolved in its done callback.
+
+    """
+
+    def __init__(self, inner: Future) -> None:
+        super().__init__()
+        self._inner = inner
+
+    def cancel(self) -> bool:
+        # A task that is already running cannot be cancelled.
+        if not self._inner.cancel():
+            return False
+        return super().cancel()
+
+    def running(self) -> bool:
+        return self._inner.running() or super().running()
+
+
+class TimedCall:
+    """Picklable callable that returns start and end of its execution
+
+    Calling it returns a tuple of start, end, result of `fn` and the
+    exception raised by `fn` or `None`.
+
+    """
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self) -> tuple[float, float, Any, Exception | None]:
+        start = counter()
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            return start, counter(), None, e
+        return start, counter(), result, None
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from statistics import mean, median, stdev
 from time import perf_counter as counter
 from typing import Any, Callable, Iterable
 
+from horology import tracing
+from horology.outliers import OutlierDetector
 from horology.tformatter import UnitType, rescale_time
 
 
@@ -27,6 +28,16 @@ class Timed:
         Function that is called to print the summary. Use `None` to
         disable printing the summary. You can provide e.g.
         `logger.info`. By default, the built-in `print` function is used.
+    on_outlier: Callable or None, optional
+        Function that is called after an unusually long iteration with
+        its time in seconds, its number and the item of that iteration.
+        Use it to log or capture only the slow cases, e.g. with
+        `iteration_print_fn=None`. By default, outliers are not
+        detected.
+    outlier_detector: Callable or None, optional
+        Function that is called with the time of each iteration and
+        returns True for outliers. By default, `OutlierDetector()` is
+        used if `on_outlier` is provided.
 
     Attributes
     ----------
@@ -55,6 +66,15 @@ class Timed:
         min/median/max: 8.00/12.0/100 s
         average (std): 40.0 (52.0) s
         ```
+
+    Report only unusually slow iterations
+        ```
+        def report(interval, iteration, item):
+            logger.warning(f'{item} took {interval:.3g} s')
+
+        for x in Timed(requests, iteration_print_fn=None, on_outlier=report):
+            handle(x)
+        ```
     """
 
     def __init__(
@@ -63,17 +83,24 @@ class Timed:
             *,
             unit: UnitType = 'a',
             iteration_print_fn: Callable[..., Any] | None = print,
-            summary_print_fn: Callable[..., Any] | None = print
+            summary_print_fn: Callable[..., Any] | None = print,
+            on_outlier: Callable[[float, int, Any], Any] | None = None,
+            outlier_detector: Callable[[float], bool] | None = None
     ) -> None:
 
         self.iterable = iterable
         self.unit = unit
         self.iteration_print_fn = iteration_print_fn or (lambda _: None)
         self.summary_print_fn = summary_print_fn or (lambda _: None)
+        self.on_outlier = on_outlier
+        if on_outlier is not None and outlier_detector is None:
+            outlier_detector = OutlierDetector()
+        self.outlier_detector = outlier_detector
 
         self.intervals: list[float] = []
         self._start: float | None = None
         self._last: float | None = None
+        self._item: Any = None
 
     def __iter__(self) -> Timed:
         self._start = counter()
@@ -86,14 +113,21 @@ class Timed:
             if self._last is not None:
                 interval = now - self._last
                 self.intervals.append(interval)
+                if (recorder := tracing.recorder) is not None:
+                    recorder.add(f'iteration {self.num_iterations}', self._last, now, 'Timed')
                 t, u = rescale_time(interval, self.unit)
                 self.iteration_print_fn(f'iteration {self.num_iterations:4}: {t:.3g} {u}')
+                if self.on_outlier is not None and self.outlier_detector(interval):
+                    self.on_outlier(interval, self.num_iterations, self._item)
 
             self._last = now
 
-            return next(self.iterable)
+            self._item = next(self.iterable)
+            return self._item
 
         except StopIteration:
+            if (recorder := tracing.recorder) is not None and self._last is not None:
+                recorder.add('Timed', self._start, self._last, 'Timed')
             self.print_summary()
             raise StopIteration
 
@@ -123,6 +157,9 @@ class Timed:
         if and where the summary is printed.
 
         """
+        # Imported here, as it takes long, e.g. for short-lived scripts.
+        from statistics import mean, median, stdev
+
         # Leave an empty line if iterations and summary are printed to
         # the same output.
         if self.iteration_print_fn == self.summary_print_fn:
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from time import perf_counter as counter
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+from horology.stats import Stats
+from horology.tformatter import UnitType, rescale_time
+from horology.timed_executor import TimedCall
+
+
+class TimedMap:
+    """Parallel map over an iterable that measures time of each item
+
+    Calls `fn` on each item of `iterable` on a pool of threads or
+    processes and yields the results. At most `max_in_flight` items are
+    submitted at once, so the iterable is consumed lazily and memory
+    stays bounded. Time of each item is measured in the worker that
+    processes it. After all results are yielded, a summary in the format
+    of `Timed` is printed with throughput and utilisation of workers.
+    The median is estimated from a random sample of at most
+    `sample_size` items.
+
+    Parameters
+    ----------
+    fn: Callable
+        Function called with each item. For process pools, it must be
+        picklable.
+    iterable: Iterable
+        Items to be processed.
+    executor: {'thread', 'process'} or Executor, optional
+        Kind of pool to be created, and shut down at the end, or an
+        existing executor, which is left running.
+    max_workers: int or None, optional
+        Number of workers of the created pool. By default, the default
+        of the pool is used.
+    max_in_flight: int or None, optional
+        How many items can be submitted and not yet yielded. By default,
+        twice the number of workers.
+    ordered: bool, optional
+        Whether results are yielded in the order of `iterable` (default)
+        or as soon as they are completed.
+    unit: str, optional
+        Time unit used to print elapsed time. Possible values:
+         ['ns', 'us', 'ms', 's', 'min', 'h', 'd']. Use 'a' or 'auto'
+         for automatic time adjustment (default).
+    item_print_fn: Callable or None, optional
+        Function that is called after each item to print its time. Use
+        `None` to disable printing. By default, the built-in `print`
+        function is used.
+    summary_print_fn: Callable or None, optional
+        Function that is called to print the summary. Use `None` to
+        disable printing the summary. By default, the built-in `print`
+        function is used.
+    sample_size: int, optional
+        How many times of items are kept to estimate the median.
+        Default 10 000.
+
+    Attributes
+    ----------
+    stats: Stats
+        Statistics of times of processing each item.
+    total: float
+        Time from the start of the iteration until the last result in
+        seconds.
+
+    Example
+    -------
+    Basic usage
+        ```
+        from horology import TimedMap
+        for image in TimedMap(resize, paths, executor='process'):
+            save(image)
+        ```
+
+        Possible result:
+        ```
+        item    1: 120 ms
+        item    2: 131 ms
+        item    3: 98.4 ms
+
+        total 3 items in 145 ms
+        min/median/max: 98.4/120/131 ms
+        average (std): 116 (16.6) ms
+        throughput: 20.7 items/s
+        worker utilisation: 10% of 24 workers
+        ```
+    """
+
+    def __init__(
+            self,
+            fn: Callable[[Any], Any],
+            iterable: Iterable,
+            *,
+            executor: Literal['thread', 'process'] | Executor = 'thread',
+            max_workers: int | None = None,
+            max_in_flight: int | None = None,
+            ordered: bool = True,
+            unit: UnitType = 'a',
+            item_print_fn: Callable[..., Any] | None = print,
+            summary_print_fn: Callable[..., Any] | None = print,
+            sample_size: int = 10_000
+    ) -> None:
+        if executor not in ('thread', 'process') and not isinstance(executor, Executor):
+            raise ValueError(f"Unknown executor: {executor}. Use 'thread', 'process' "
+                             f"or an instance of Executor.")
+
+        self.fn = fn
+        self.iterable = iterable
+        self.executor = executor
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self.ordered = ordered
+        self.unit = unit
+        self.item_print_fn = item_print_fn or (lambda _: None)
+        self.summary_print_fn = summary_print_fn or (lambda _: None)
+
+        self.stats = Stats(sample_size=sample_size)
+        self.total = 0.
+
+    def __iter__(self) -> Iterator:
+        if isinstance(self.executor, Executor):
+            executor = self.executor
+        elif self.executor == 'process':
+            executor = ProcessPoolExecutor(self.max_workers)
+        else:
+            executor = ThreadPoolExecutor(self.max_workers)
+        self.max_workers = getattr(executor, '_max_workers', self.max_workers)
+        max_in_flight = self.max_in_flight or 2 * (self.max_workers or os.cpu_count() or 1)
+
+        start = counter()
+        items = enumerate(self.iterable, start=1)
+        in_flight: deque[tuple[int, Future]] = deque()
+
+        def submit() -> bool:
+            next_item = next(items, None)
+            if next_item is None:
+                return False
+            number, item = next_item
+            in_flight.append((number, executor.submit(TimedCall(self.fn, (item,), {}))))
+            return True
+
+        try:
+            while len(in_flight) < max_in_flight and submit():
+                pass
+
+            while in_flight:
+                if self.ordered:
+                    number, future = in_flight.popleft()
+                else:
+                    wait([f for _, f in in_flight], return_when=FIRST_COMPLETED)
+                    number, future = next(x for x in in_flight if x[1].done())
+                    in_flight.remove((number, future))
+                submit()
+                result = self._result(number, future)
+                self.total = counter() - start
+                yield result
+        finally:
+            if executor is not self.executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        self.print_summary()
+
+    def print_summary(self) -> None:
+        """ Print statistics of times of items, throughput and utilisation
+
+        It is called automatically when all results were yielded.
+
+        """
+        n = self.stats.num_intervals
+        if self.item_print_fn == self.summary_print_fn:
+            print_str = '\n'
+        else:
+            print_str = ''
+
+        if n == 0:
+            self.summary_print_fn('no items')
+            return
+
+        t_total, u_total = rescale_time(self.total, self.unit)
+        print_str += f'total {n} items in {t_total:.3g} {u_total}\n'
+        print_str += self.stats.summary(self.unit)
+        if self.total > 0:
+            print_str += f'\nthroughput: {n / self.total:.3g} items/s'
+            if self.max_workers:
+                utilisation = self.stats.total / (self.max_workers * self.total)
+                print_str += f'\nworker utilisation: {utilisation:.0%} of {self.max_workers} workers'
+
+        self.summary_print_fn(print_str)
+
+    def _result(self, number: int, future: Future) -> Any:
+        start, end, result, exception = future.result()
+        self.stats.add(end - start)
+        t, u = rescale_time(end - start, self.unit)
+        self.item_print_fn(f'item {number:4}: {t:.3g} {u}' + (' (failed)' if exception else ''))
+        if exception is not None:
+            raise exception
+        return result
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import os
+import sys
+from time import perf_counter as counter
+from types import TracebackType
+from typing import Any, Literal, Type
+
+# Recorder that is currently active, if any. `Timing`, `timed` and
+# `Timed` check it after each measurement. Read it only once into a
+# local variable, another thread may stop the recorder in between.
+recorder: TraceRecorder | None = None
+
+
+class TraceRecorder:
+    """Records spans measured by horology as a Chrome trace
+
+    While active, every measurement of `Timing`, `timed` and `Timed` is
+    saved as a span with its start, duration, thread and asyncio task.
+    Spans are written to a file in the Chrome Trace Event JSON format
+    in chunks, so the memory used does not grow with the time of
+    recording. Open the file in https://ui.perfetto.dev or in
+    `chrome://tracing` to see a timeline.
+
+    Spans from different threads are shown on separate tracks. Spans of
+    asyncio tasks that run concurrently are shown on separate tracks of
+    their thread, which are reused by other tasks once a task is done.
+    Name of the task is saved in the arguments of each of its spans.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        File to which the trace is written. It is overwritten.
+    chunk_size: int, optional
+        How many spans are kept in memory before writing them to the
+        file.
+
+    Example
+    -------
+    Basic usage
+        ```
+        from horology import TraceRecorder
+        with TraceRecorder('trace.json'):
+            run_server()
+        ```
+    """
+
+    def __init__(self, path: str | os.PathLike, *, chunk_size: int = 1000) -> None:
+        # Imported here, so that tracing costs nothing when not used.
+        import json
+        import threading
+
+        self.path = path
+        self.chunk_size = chunk_size
+
+        self._dumps = json.dumps
+        self._threading = threading
+        self._lock = threading.Lock()
+        self._events: list[dict[str, Any]] = []
+        # Maps (thread id, asyncio task or None) to a track id. Tracks of
+        # tasks are moved to `_free_tracks` when the tasks are done.
+        self._tracks: dict[tuple[int, Any], int] = {}
+        self._num_task_tracks: dict[int, int] = {}
+        self._free_tracks: dict[int, list[int]] = {}
+        self._num_tracks = 0
+        self._file: Any = None
+        self._is_first_chunk = True
+        self._origin = 0.
+        self._pid = os.getpid()
+
+    def start(self) -> None:
+        """Open the file and start recording"""
+        global recorder
+        if recorder is not None:
+            raise RuntimeError('Another TraceRecorder is already recording.')
+        self._file = open(self.path, 'w')
+        self._file.write('[\n')
+        self._is_first_chunk = True
+        self._tracks.clear()
+        self._num_task_tracks.clear()
+        self._free_tracks.clear()
+        self._num_tracks = 0
+        self._origin = counter()
+        recorder = self
+
+    def stop(self) -> None:
+        """Stop recording and write the remaining spans
+
+        Does nothing if the recorder is not recording.
+
+        """
+        global recorder
+        if recorder is self:
+            recorder = None
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush()
+            self._file.write('\n]\n')
+            self._file.close()
+            self._file = None
+
+    def add(self, name: str, start: float, end: float, category: str = '') -> None:
+        """Save a span
+
+        Parameters
+        ----------
+        name: str
+            Name of the span shown on the timeline.
+        start, end: float
+            Beginning and end of the span, from `time.perf_counter`.
+        category: str, optional
+            Category of the span, e.g. name of the horology tool.
+
+        """
+        thread_id = self._threading.get_ident()
+        task = _current_task()
+        with self._lock:
+            if self._file is None:
+                return
+            track = self._tracks.get((thread_id, task))
+            if track is None:
+                track = self._add_track(thread_id, task)
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': self._pid,
+                'tid': track,
+            }
+            if task is not None:
+                event['args'] = {'task': task.get_name()}
+            self._events.append(event)
+            if len(self._events) >= self.chunk_size:
+                self._flush()
+
+    def __enter__(self) -> TraceRecorder:
+        self.start()
+        return self
+
+    def __exit__(
+            self,
+            exc_type: Type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> Literal[False]:
+        self.stop()
+        return False
+
+    def _add_track(self, thread_id: int, task: Any) -> int:
+        if task is not None:
+            task.add_done_callback(lambda t: self._release_track(thread_id, t))
+            free = self._free_tracks.setdefault(thread_id, [])
+            if free:
+                track = self._tracks[thread_id, task] = free.pop()
+                return track
+
+        self._num_tracks += 1
+        track = self._tracks[thread_id, task] = self._num_tracks
+        track_name = self._threading.current_thread().name
+        if task is not None:
+            num = self._num_task_tracks[thread_id] = self._num_task_tracks.get(thread_id, 0) + 1
+            track_name = f'{track_name} tasks {num}'
+        self._events.append({
+            'name': 'thread_name',
+            'ph': 'M',
+            'pid': self._pid,
+            'tid': track,
+            'args': {'name': track_name, 'thread_id': thread_id},
+        })
+        return track
+
+    def _release_track(self, thread_id: int, task: Any) -> None:
+        with self._lock:
+            track = self._tracks.pop((thread_id, task), None)
+            if track is not None:
+                self._free_tracks[thread_id].append(track)
+
+    def _flush(self) -> None:
+        if not self._events:
+            return
+        if not self._is_first_chunk:
+            self._file.write(',\n')
+        self._file.write(',\n'.join(self._dumps(e) for e in self._events))
+        self._file.flush()
+        self._is_first_chunk = False
+        self._events.clear()
+
+
+def _current_task() -> Any:
+    asyncio = sys.modules.get('asyncio')
+    if asyncio is None:
+        return None
+    try:
+        return asyncio.current_task()
+    except RuntimeError:  # no running event loop
+        return None
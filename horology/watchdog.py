@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+import threading
+import traceback
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter as counter
+from typing import Any, Callable, NamedTuple
+
+from horology.tformatter import UnitType, rescale_time
+
+
+class _Block(NamedTuple):
+    name: str
+    start: float
+    budget: float
+    thread_id: int
+    unit: UnitType
+    print_fn: Callable[..., Any]
+
+
+class Watchdog:
+    """Thread that reports blocks still running past their budget
+
+    A single daemon thread is started on the first call to `watch`. It
+    sleeps until the nearest deadline, and for each block that has not
+    finished by then, prints how long it has been running and the
+    current stack of the thread executing it. Each block is reported
+    only once.
+
+    Use the shared instance `shared_watchdog` rather than creating new
+    ones, e.g. through `Timing(watchdog=True)` or
+    `timed(watchdog=True)`.
+
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._blocks: dict[int, _Block] = {}
+        self._deadlines: list[tuple[float, int]] = []
+        self._tokens = count()
+        self._thread: threading.Thread | None = None
+
+    def watch(
+            self,
+            name: str,
+            budget: float,
+            print_fn: Callable[..., Any],
+            unit: UnitType = 'auto'
+    ) -> int:
+        """Start watching a block that runs in the current thread
+
+        Returns
+        -------
+        int
+            Token to be passed to `unwatch` when the block finishes.
+
+        """
+        start = counter()
+        token = next(self._tokens)
+        with self._condition:
+            self._blocks[token] = _Block(name, start, budget, threading.get_ident(), unit, print_fn)
+            heappush(self._deadlines, (start + budget, token))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='horology-watchdog',
+                                                daemon=True)
+                self._thread.start()
+            elif self._deadlines[0][1] == token:  # wake up earlier than planned
+                self._condition.notify()
+        return token
+
+    def unwatch(self, token: int) -> None:
+        """Stop watching the block, it will not be reported anymore"""
+        with self._condition:
+            self._blocks.pop(token, None)
+
+    def _run(self) -> None:
+        while True:
+            block = self._wait_for_stalled()
+            try:
+                self._report(block)
+            except Exception:
+                # The thread is shared, so it must survive a failing print_fn.
+                traceback.print_exc()
+
+    def _wait_for_stalled(self) -> _Block:
+        with self._condition:
+            while True:
+                # Skip deadlines of blocks that already finished.
+                while self._deadlines and self._deadlines[0][1] not in self._blocks:
+                    heappop(self._deadlines)
+
+                now = counter()
+                if self._deadlines and self._deadlines[0][0] <= now:
+                    _, token = heappop(self._deadlines)
+                    return self._blocks[token]
+
+                timeout = self._deadlines[0][0] - now if self._deadlines else None
+                self._condition.wait(timeout)
+
+    @staticmethod
+    def _report(block: _Block) -> None:
+        t, u = rescale_time(counter() - block.start, block.unit)
+        t_budget, u_budget = rescale_time(block.budget, block.unit)
+        print_str = f'{block.name}still running after {t:.3g} {u}, ' \
+                    f'budget {t_budget:.3g} {u_budget} exceeded'
+        frame = sys._current_frames().get(block.thread_id)
+        if frame is not None:
+            print_str += '\n' + ''.join(traceback.format_stack(frame)).rstrip()
+        block.print_fn(print_str)
+
+
+shared_watchdog = Watchdog()
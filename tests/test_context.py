@@ -115,3 +115,80 @@ class TestContext:
 
         # Accessing interval after context should not raise an error
         _ = timing_instance.interval
+
+    def test_over_budget(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.25]
+        calls = []
+
+        with redirect_stdout(out := StringIO()):
+            with Timing(name='Request: ', budget=0.2,
+                        on_over_budget=lambda *args: calls.append(args)):
+                pass
+            print_str = out.getvalue().strip()
+
+        assert print_str == 'Request: 250 ms (over budget)'
+        assert calls == [(0.25, 'Request: ')]
+
+    def test_within_budget(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.15]
+        calls = []
+
+        with redirect_stdout(out := StringIO()):
+            with Timing(budget=0.2, on_over_budget=lambda *args: calls.append(args)):
+                pass
+            print_str = out.getvalue().strip()
+
+        assert print_str == '150 ms'
+        assert calls == []
+
+    def test_watchdog_requires_budget(self, _: Mock) -> None:
+        with pytest.raises(ValueError):
+            Timing(watchdog=True)
+
+    def test_laps(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.1, 0.4, 0.5, 0.55]
+
+        with Timing(print_fn=None) as t:
+            assert t.lap('parse') == 0.1
+            t.lap('query')
+            t.lap('parse')
+
+        assert t.laps == pytest.approx({'parse': 0.2, 'query': 0.3, '(rest)': 0.05})
+
+    def test_lap_outside_context(self, _: Mock) -> None:
+        with pytest.raises(RuntimeError):
+            Timing().lap('parse')
+
+    def test_phase_summary(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.01, 0.04, 0.04, 1, 1.03, 1.09, 1.09]
+        Timing.reset_phase_stats()
+
+        timing = Timing(name='Request: ', print_fn=None)
+        for _ in range(2):
+            with timing as t:
+                t.lap('parse')
+                t.lap('query')
+
+        with redirect_stdout(out := StringIO()):
+            Timing.print_phase_summary('Request: ', unit='ms')
+            lines = out.getvalue().strip().split('\n')
+
+        assert lines[0] == 'Request: 2 calls in 130 ms, min/mean/max: 40/65/90 ms'
+        assert lines[1] == '  parse: 31% of total, mean 20 ms, p50/p90/p99: 20/28/29.8 ms'
+        assert lines[2] == '  query: 69% of total, mean 45 ms, p50/p90/p99: 45/57/59.7 ms'
+        assert lines[3] == '  (rest): 0% of total, mean 0 ms, p50/p90/p99: 0/0/0 ms'
+        assert t.interval == pytest.approx(0.09)
+        Timing.reset_phase_stats()
+
+    def test_reset_phase_stats(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.01, 0.02, 0.02] * 2
+        for name in ('A: ', 'B: '):
+            with Timing(name=name, print_fn=None) as t:
+                t.lap('parse')
+
+        Timing.reset_phase_stats('A: ')
+        assert 'A: ' not in Timing.phase_stats
+        assert 'B: ' in Timing.phase_stats
+
+        Timing.reset_phase_stats()
+        assert Timing.phase_stats == {}
@@ -0,0 +1,59 @@
+from math import isnan
+from threading import Thread
+
+import pytest
+
+from horology import CostModel
+
+
+class TestCostModel:
+
+    def test_linear(self) -> None:
+        model = CostModel()
+        for n in range(1, 100):
+            model.add(n, 0.5 + 0.25 * n)
+
+        assert model.num_calls == 99
+        assert model.intercept == pytest.approx(0.5)
+        assert model.slope == pytest.approx(0.25)
+
+    def test_quadratic(self) -> None:
+        model = CostModel()
+        for n in [10, 20, 40, 80, 160]:
+            model.add(n, 3e-7 * n ** 2)
+
+        assert model.exponent == pytest.approx(2)
+        assert model.coefficient == pytest.approx(3e-7)
+
+    def test_not_enough_sizes(self) -> None:
+        model = CostModel()
+        model.add(10, 1)
+        model.add(10, 2)
+
+        assert isnan(model.slope)
+        assert model.summary() == 'cost model: not enough different sizes'
+
+    def test_non_positive_sizes_are_skipped_in_log_log(self) -> None:
+        model = CostModel()
+        for n in [0, 1, 2, 4]:
+            model.add(n, 0.1 * n)
+
+        assert model.exponent == pytest.approx(1)
+        assert model.summary('s') == 'linear fit: time = 0 s + 0.1 s * size\nlog-log fit: time ~ size^1'
+
+    def test_threads(self) -> None:
+        model = CostModel()
+
+        def add_many() -> None:
+            for n in range(1, 2001):
+                model.add(n, 0.5 + 0.25 * n)
+
+        threads = [Thread(target=add_many) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert model.num_calls == 8000
+        assert model.slope == pytest.approx(0.25)
+        assert model.intercept == pytest.approx(0.5)
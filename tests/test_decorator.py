@@ -124,3 +124,136 @@ class TestDecorator:
             print_str = out.getvalue().strip()
 
         assert print_str == 'foo: 120 ms (failed)'
+
+    def test_hottest_lines(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.12]
+
+        @timed(lines=2)
+        def foo():
+            a = sum(range(10_000))
+            b = 1
+            return a + b
+
+        with redirect_stdout(out := StringIO()):
+            foo()
+            lines = out.getvalue().strip().split('\n')
+
+        assert lines[0] == 'foo: 120 ms'
+        assert len(lines) == 3
+        assert lines[1].startswith('  line ')
+        assert lines[1].endswith('a = sum(range(10_000))')
+        assert set(foo.line_intervals) == {foo.__wrapped__.__code__.co_firstlineno + i for i in (2, 3, 4)}
+
+    def test_hottest_lines_in_summary(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.1, 0, 0.1]
+
+        @timed(print_fn=None, lines=1)
+        def foo():
+            return sum(range(100_000))
+
+        foo()
+        first_call = dict(foo.line_intervals)
+        foo()
+
+        (line, interval), = first_call.items()
+        assert foo.line_intervals[line] > interval
+
+        with redirect_stdout(out := StringIO()):
+            foo.print_summary()
+            lines = out.getvalue().strip().split('\n')
+
+        assert lines == ['foo:', f'  line {line:4}: ' + lines[1].split(': ', 1)[1]]
+        assert lines[1].endswith('(100%)  return sum(range(100_000))')
+
+    def test_lines_of_builtin(self, _: Mock) -> None:
+        with pytest.raises(TypeError):
+            timed(lines=1)(print)
+
+    def test_on_outlier(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 1, 1, 11, 11, 12]
+        outliers = []
+
+        @timed(print_fn=None,
+               on_outlier=lambda *args: outliers.append(args),
+               outlier_detector=lambda interval: interval > 5)
+        def foo(x, y=0):
+            pass
+
+        foo(1)
+        foo(2, y=3)
+        foo(4)
+
+        assert outliers == [(10, (2,), {'y': 3})]
+
+    def test_aggregate(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 1, 1, 4]
+
+        @timed(print_fn=None, aggregate=True)
+        def foo():
+            pass
+
+        foo()
+        foo()
+
+        assert foo.stats is not None
+        assert foo.stats.num_intervals == 2
+        assert foo.stats.total == 4
+        assert foo.stats.max == 3
+
+    def test_over_budget(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.25, 1, 1.1]
+        calls = []
+
+        @timed(budget=0.2, on_over_budget=lambda *args: calls.append(args))
+        def foo(x):
+            pass
+
+        with redirect_stdout(out := StringIO()):
+            foo(1)
+            foo(2)
+            lines = out.getvalue().strip().split('\n')
+
+        assert lines == ['foo: 250 ms (over budget)', 'foo: 100 ms']
+        assert calls == [(0.25, (1,), {})]
+
+    def test_buckets_and_cost_model(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0.01, 0, 0.02, 0, 0.1, 0, 0.2]
+
+        @timed(print_fn=None, aggregate=True, key=lambda batch: 'large' if len(batch) > 5 else 'small',
+               size=len)
+        def process(batch):
+            pass
+
+        for n in [1, 2, 10, 20]:
+            process([0] * n)
+
+        assert process.buckets['small'].num_intervals == 2
+        assert process.cost_model is not None
+        assert process.buckets['large'].total == pytest.approx(0.3)
+        assert process.cost_model.exponent == pytest.approx(1)
+        assert process.cost_model.slope == pytest.approx(0.01)
+
+        with redirect_stdout(out := StringIO()):
+            process.print_summary()
+            lines = out.getvalue().strip().split('\n')
+
+        assert lines[0] == 'process: 4 calls in 330 ms, min/mean/max: 10/82.5/200 ms'
+        assert lines[1] == '  large: 2 calls in 300 ms, min/mean/max: 100/150/200 ms'
+        assert lines[2] == '  small: 2 calls in 30 ms, min/mean/max: 10/15/20 ms'
+        assert lines[3].startswith('  linear fit: time = ')
+        assert lines[4] == '  log-log fit: time ~ size^1'
+
+    def test_key_and_size_see_arguments_before_call(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 1]
+
+        @timed(print_fn=None, key=len, size=len)
+        def drain(batch):
+            batch.clear()
+            raise ValueError('An error occurred')
+
+        with pytest.raises(ValueError, match='An error occurred'):
+            drain([1, 2, 3])
+
+        assert list(drain.buckets) == [3]
+        assert drain.cost_model is not None
+        assert drain.cost_model.num_calls == 1
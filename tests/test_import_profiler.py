@@ -0,0 +1,107 @@
+import importlib
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+import horology
+from horology import ImportProfiler
+from horology.__main__ import main
+
+
+@pytest.fixture
+def package(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    pkg = tmp_path / 'horology_import_pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('from horology_import_pkg import a, b\n')
+    (pkg / 'a.py').write_text('import horology_import_pkg.c\n')
+    (pkg / 'b.py').write_text('x = 1\n')
+    (pkg / 'c.py').write_text('y = 2\n')
+    (tmp_path / 'script.py').write_text('import sys\nimport horology_import_pkg\nprint(sys.argv[1:])\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in list(sys.modules):
+        if name.startswith('horology_import_pkg'):
+            del sys.modules[name]
+
+
+class TestImportProfiler:
+
+    def test_tree(self, package: Path) -> None:
+        meta_path = list(sys.meta_path)
+
+        with redirect_stdout(out := StringIO()):
+            with ImportProfiler(unit='ms') as profiler:
+                horology_import_pkg = importlib.import_module('horology_import_pkg')
+            lines = out.getvalue().strip().split('\n')
+
+        assert sys.meta_path == meta_path
+        assert horology_import_pkg.b.x == 1
+        assert horology_import_pkg.__loader__.__class__.__name__ == 'SourceFileLoader'
+
+        root, = profiler.roots
+        assert root.name == 'horology_import_pkg'
+        assert [c.name for c in root.children] == ['horology_import_pkg.a', 'horology_import_pkg.b']
+        assert [c.name for c in root.children[0].children] == ['horology_import_pkg.c']
+        assert 0 <= root.self_interval <= root.interval
+
+        assert lines[0].startswith('horology_import_pkg: ')
+        assert '(self ' in lines[0]
+        assert lines[1].startswith('  horology_import_pkg.a: ')
+        assert lines[2].startswith('    horology_import_pkg.c: ')
+        assert lines[3].startswith('  horology_import_pkg.b: ')
+        assert lines[-1].startswith('total 4 modules in ')
+
+    def test_min_interval(self, package: Path) -> None:
+        with redirect_stdout(out := StringIO()):
+            with ImportProfiler(min_interval=100):
+                importlib.import_module('horology_import_pkg')
+            lines = out.getvalue().strip().split('\n')
+
+        assert lines == ['total 4 modules in ' + lines[0].split(' in ')[1]]
+
+    def test_failed_import(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        (tmp_path / 'horology_broken_module.py').write_text('import math\nraise ValueError\n')
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        with ImportProfiler(print_fn=None) as profiler:
+            with pytest.raises(ValueError):
+                importlib.import_module('horology_broken_module')
+
+        assert [r.name for r in profiler.roots] == ['horology_broken_module']
+        assert not profiler._stack
+
+    def test_cli_script(self, package: Path, capsys: pytest.CaptureFixture) -> None:
+        main(['importtime', str(package / 'script.py'), '--flag'])
+
+        captured = capsys.readouterr()
+        assert captured.out.strip() == "['--flag']"
+        assert 'horology_import_pkg: ' in captured.err
+        assert '\ntotal ' in captured.err
+
+    def test_cli_excludes_runpy_imports(self, tmp_path: Path) -> None:
+        script = tmp_path / 'script.py'
+        script.write_text('x = 1\n')
+
+        result = subprocess.run([sys.executable, '-m', 'horology', 'importtime', str(script)],
+                                capture_output=True, text=True, check=True)
+
+        assert result.stderr.startswith('total 0 modules in ')
+
+
+def test_lazy_imports() -> None:
+    code = 'import sys\nfrom horology import Timed, Timing, timed\n' \
+           'print(sorted(m for m in ["statistics", "inspect", "linecache"] if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_dir() -> None:
+    _ = horology.Stats  # accessed names are cached in the module globals
+    names = dir(horology)
+    assert len(names) == len(set(names))
+    assert set(horology.__all__) <= set(names)
+    assert 'TYPE_CHECKING' not in names
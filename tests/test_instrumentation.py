@@ -0,0 +1,133 @@
+import importlib
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from horology import Instrumentation, instrument
+
+
+class Animal:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def speak(self) -> str:
+        return self.name
+
+    @staticmethod
+    def kind() -> str:
+        return 'animal'
+
+    @classmethod
+    def create(cls) -> 'Animal':
+        return cls('cat')
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+def make_module() -> ModuleType:
+    module = ModuleType('zoo')
+    exec('def feed(x):\n    return x\n\nclass Keeper:\n    def clean(self):\n        pass\n',
+         module.__dict__)
+    setattr(module, 'Path', Path)  # imported objects should not be instrumented
+    return module
+
+
+class TestInstrument:
+
+    def test_class(self) -> None:
+        original = Animal.__dict__['speak']
+
+        with instrument(Animal, summary_print_fn=None) as ins:
+            a = Animal.create()
+            a.speak()
+            a.speak()
+            assert Animal.kind() == 'animal'
+            assert repr(a) == 'cat'
+
+        prefix = f'{__name__}.Animal.'
+        assert ins.stats[prefix + 'speak'].num_intervals == 2
+        assert ins.stats[prefix + 'create'].num_intervals == 1
+        assert ins.stats[prefix + 'kind'].num_intervals == 1
+        assert ins.stats[prefix + '__init__'].num_intervals == 1
+        assert prefix + '__repr__' not in ins.stats
+        assert Animal.__dict__['speak'] is original
+
+    def test_alias(self) -> None:
+        module = make_module()
+        exec('bar = feed', module.__dict__)
+
+        with instrument(module, summary_print_fn=None) as ins:
+            module.feed(1)
+            module.bar(2)
+            assert module.bar is module.feed
+
+        assert ins.stats['zoo.feed'].num_intervals == 2
+        assert module.bar is module.feed
+
+    def test_module(self) -> None:
+        zoo = make_module()
+        original = zoo.feed
+
+        with instrument(zoo, summary_print_fn=None) as ins:
+            assert zoo.feed(3) == 3
+            zoo.Keeper().clean()
+
+        assert ins.stats['zoo.feed'].num_intervals == 1
+        assert ins.stats['zoo.Keeper.clean'].num_intervals == 1
+        assert set(ins.stats) == {'zoo.feed', 'zoo.Keeper.clean'}
+        assert zoo.feed is original
+
+    def test_summary(self) -> None:
+        zoo = make_module()
+
+        with redirect_stdout(out := StringIO()):
+            with instrument(zoo, unit='ms'):
+                zoo.feed(1)
+            lines = out.getvalue().strip().split('\n')
+
+        assert len(lines) == 1
+        assert lines[0].startswith('zoo.feed: 1 calls in ')
+
+    def test_no_calls(self) -> None:
+        with redirect_stdout(out := StringIO()):
+            with instrument(make_module()):
+                pass
+
+        assert out.getvalue().strip() == 'no calls'
+
+    def test_instrumenting_twice(self) -> None:
+        zoo = make_module()
+
+        with instrument(zoo, summary_print_fn=None):
+            with instrument(zoo, summary_print_fn=None) as inner:
+                zoo.feed(1)
+
+        assert inner.stats == {}
+
+    def test_wrong_target(self) -> None:
+        with pytest.raises(TypeError):
+            Instrumentation().add(len)  # type: ignore[arg-type]
+
+    def test_import_hook(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        (tmp_path / 'horology_test_pkg').mkdir()
+        (tmp_path / 'horology_test_pkg' / '__init__.py').write_text('')
+        (tmp_path / 'horology_test_pkg' / 'mod.py').write_text('def foo():\n    return 42\n')
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        meta_path = list(sys.meta_path)
+        try:
+            with instrument(imports='horology_test_pkg.*', summary_print_fn=None) as ins:
+                mod = importlib.import_module('horology_test_pkg.mod')
+                assert mod.foo() == 42
+                assert mod.__loader__.__class__.__name__ == 'SourceFileLoader'
+        finally:
+            for name in ['horology_test_pkg', 'horology_test_pkg.mod']:
+                sys.modules.pop(name, None)
+
+        assert sys.meta_path == meta_path
+        assert ins.stats['horology_test_pkg.mod.foo'].num_intervals == 1
@@ -79,3 +79,15 @@ class TestTimedIterableTest:
 
         assert lines == ['cat', 'dog', 'parrot']
         assert T.total == 30
+
+    def test_on_outlier(self, counter_mock: Mock) -> None:
+        counter_mock.side_effect = [0, 0, 1, 2, 12, 13]
+        outliers = []
+
+        T = Timed('abcd', iteration_print_fn=None, summary_print_fn=None,
+                  on_outlier=lambda *args: outliers.append(args),
+                  outlier_detector=lambda interval: interval > 5)
+        for _ in T:
+            pass
+
+        assert outliers == [(10, 3, 'c')]
@@ -0,0 +1,80 @@
+import sys
+import threading
+
+from horology.line_timer import LineTimer
+
+
+def spin(n: int) -> int:
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+class TestLineTimer:
+
+    def test_lines_are_recorded(self) -> None:
+        lt = LineTimer(spin.__code__)
+        lt.start()
+        spin(1000)
+        lt.stop()
+        lt.close()
+
+        first = spin.__code__.co_firstlineno
+        assert set(lt.intervals) == {first + i for i in range(1, 5)}
+        assert all(x >= 0 for x in lt.intervals.values())
+
+    def test_hottest_and_source(self) -> None:
+        lt = LineTimer(spin.__code__)
+        lt.start()
+        spin(10_000)
+        lt.stop()
+        lt.close()
+
+        (line, _), = lt.hottest(1)
+        assert lt.source(line) in ('for i in range(n):', 'total += i')
+
+    def test_other_functions_are_not_recorded(self) -> None:
+        def bar() -> None:
+            spin(100)
+
+        lt = LineTimer(bar.__code__)
+        lt.start()
+        bar()
+        lt.stop()
+        lt.close()
+
+        assert list(lt.intervals) == [bar.__code__.co_firstlineno + 1]
+
+    def test_other_threads_are_not_recorded(self) -> None:
+        lt = LineTimer(spin.__code__)
+        lt.start()
+        thread = threading.Thread(target=spin, args=(100,))
+        thread.start()
+        thread.join()
+        lt.stop()
+        lt.close()
+
+        assert not lt.intervals
+
+    def test_previous_tracer_is_restored(self) -> None:
+        previous = sys.gettrace()
+        lt = LineTimer(spin.__code__)
+        lt.start()
+        spin(10)
+        lt.stop()
+        lt.close()
+
+        assert sys.gettrace() is previous
+
+    def test_totals_of_runs(self) -> None:
+        lt = LineTimer(spin.__code__)
+        for n in (10, 20):
+            lt.start()
+            spin(n)
+            lt.stop()
+            last = dict(lt.intervals)
+        lt.close()
+
+        assert set(lt.total_intervals) == set(last)
+        assert all(lt.total_intervals[line] >= last[line] for line in last)
@@ -0,0 +1,33 @@
+from horology import OutlierDetector
+
+
+class TestOutlierDetector:
+
+    def test_no_outliers_during_warmup(self) -> None:
+        is_outlier = OutlierDetector(warmup=5)
+        assert not any(is_outlier(x) for x in [1, 1, 1, 1, 100])
+
+    def test_slow_interval_is_outlier(self) -> None:
+        is_outlier = OutlierDetector()
+        for i in range(100):
+            assert not is_outlier(1 + i % 3 * 0.1)
+
+        assert is_outlier(10)
+        assert not is_outlier(1.1)
+
+    def test_min_ratio(self) -> None:
+        for interval, expected in [(2.9, False), (3.1, True)]:
+            is_outlier = OutlierDetector(min_ratio=3)
+            for _ in range(20):
+                is_outlier(1)
+
+            assert is_outlier(interval) == expected
+
+    def test_outliers_are_clipped(self) -> None:
+        is_outlier = OutlierDetector()
+        for _ in range(20):
+            is_outlier(1)
+
+        assert is_outlier(1000)
+        assert is_outlier.mean < 2
+        assert is_outlier(1000)
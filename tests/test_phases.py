@@ -0,0 +1,21 @@
+from horology import PhaseStats
+
+
+class TestPhaseStats:
+
+    def test_phases_in_order(self) -> None:
+        ps = PhaseStats()
+        ps.add({'parse': 1, 'query': 2}, 3)
+        ps.add({'render': 1, 'parse': 1}, 2)
+
+        assert list(ps.phases) == ['parse', 'query', 'render']
+        assert ps.phases['parse'].num_intervals == 2
+        assert ps.totals.total == 5
+
+    def test_sample_size(self) -> None:
+        ps = PhaseStats(sample_size=10)
+        for i in range(100):
+            ps.add({'parse': i}, i)
+
+        assert ps.phases['parse'].num_intervals == 100
+        assert len(ps.phases['parse'].intervals) == 10
@@ -0,0 +1,92 @@
+from statistics import stdev
+from threading import Thread
+
+import pytest
+
+from horology import Stats
+
+
+class TestStats:
+
+    def test_empty(self) -> None:
+        s = Stats()
+        assert s.num_intervals == 0
+        assert s.mean == 0
+        assert s.std == 0
+
+    def test_values(self) -> None:
+        values = [0.5, 1.5, 1, 4, 0.25]
+        s = Stats()
+        for x in values:
+            s.add(x)
+
+        assert s.num_intervals == 5
+        assert s.total == sum(values)
+        assert s.min == 0.25
+        assert s.max == 4
+        assert s.std == pytest.approx(stdev(values))
+        assert s.intervals == []
+
+    def test_keep_intervals(self) -> None:
+        s = Stats(keep_intervals=True)
+        s.add(1)
+        s.add(2)
+        assert s.intervals == [1, 2]
+
+    def test_percentiles(self) -> None:
+        s = Stats(keep_intervals=True)
+        for x in [3, 1, 2, 5, 4]:
+            s.add(x)
+
+        assert s.median == 3
+        assert s.percentile(0) == 1
+        assert s.percentile(100) == 5
+        assert s.percentile(25) == 2
+
+    def test_percentiles_at_once(self) -> None:
+        s = Stats(keep_intervals=True)
+        for x in [3, 1, 2, 5, 4]:
+            s.add(x)
+
+        assert s.percentiles(0, 25, 50, 100) == [1, 2, 3, 5]
+        assert Stats(keep_intervals=True).percentiles(50, 90) == [0, 0]
+
+    def test_sample(self) -> None:
+        s = Stats(sample_size=10)
+        for x in range(1, 101):
+            s.add(x)
+
+        assert s.num_intervals == 100
+        assert s.total == 5050
+        assert len(s.intervals) == 10
+        assert len(set(s.intervals)) == 10
+        assert set(s.intervals) <= set(range(1, 101))
+        assert 1 <= s.median <= 100
+
+    def test_percentiles_require_intervals(self) -> None:
+        with pytest.raises(RuntimeError):
+            _ = Stats().median
+
+    def test_summary_without_intervals(self) -> None:
+        s = Stats()
+        s.add(1)
+        s.add(3)
+
+        assert s.summary('s', prefix='run ') == 'run min/max: 1/3 s\nrun average (std): 2 (1.41) s'
+
+    def test_threads(self) -> None:
+        s = Stats()
+
+        def add_many() -> None:
+            for _ in range(10_000):
+                s.add(1)
+
+        threads = [Thread(target=add_many) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert s.num_intervals == 40_000
+        assert s.total == 40_000
+        assert s.std == 0
@@ -0,0 +1,109 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+
+from horology import TimedExecutor
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def fail() -> None:
+    raise ValueError('An error occurred')
+
+
+class TestTimedExecutor:
+
+    def test_results_and_summary(self) -> None:
+        with redirect_stdout(out := StringIO()):
+            with TimedExecutor(ThreadPoolExecutor(2)) as executor:
+                results = list(executor.map(square, range(10)))
+            lines = out.getvalue().strip().split('\n')
+
+        assert results == [x * x for x in range(10)]
+        assert executor.queue_stats.num_intervals == 10
+        assert executor.run_stats.num_intervals == 10
+        assert lines[0].startswith('total 10 tasks in ')
+        assert lines[1].startswith('queue wait min/median/max: ')
+        assert lines[2].startswith('queue wait average (std): ')
+        assert lines[3].startswith('run min/median/max: ')
+        assert lines[4].startswith('run average (std): ')
+        assert lines[5].startswith('worker utilisation: ')
+        assert lines[5].endswith(f'of 2 workers, max queue length {executor.max_queue_length}')
+
+    def test_sample_size(self) -> None:
+        with TimedExecutor(ThreadPoolExecutor(2), summary_print_fn=None, sample_size=5) as executor:
+            list(executor.map(square, range(20)))
+
+        assert executor.run_stats.num_intervals == 20
+        assert len(executor.queue_stats.intervals) == 5
+        assert len(executor.run_stats.intervals) == 5
+
+    def test_queue_wait(self) -> None:
+        event = threading.Event()
+        with TimedExecutor(ThreadPoolExecutor(1), summary_print_fn=None) as executor:
+            blocking = executor.submit(event.wait)
+            waiting = executor.submit(square, 3)
+            threading.Timer(0.05, event.set).start()
+            assert waiting.result() == 9
+            assert blocking.result() is True
+
+        assert executor.max_queue_length == 1
+        assert executor.queue_stats.max >= 0.04
+        assert executor.run_stats.max >= 0.04
+
+    def test_cancel(self) -> None:
+        started = threading.Event()
+        event = threading.Event()
+
+        def block() -> bool:
+            started.set()
+            return event.wait()
+
+        with TimedExecutor(ThreadPoolExecutor(1), summary_print_fn=None) as executor:
+            running = executor.submit(block)
+            waiting = executor.submit(square, 3)
+            try:
+                assert started.wait(2)
+                assert running.running()
+                assert not running.cancel()
+                assert not running.cancelled()
+                assert not waiting.running()
+                assert waiting.cancel()
+                assert waiting.cancelled()
+            finally:
+                event.set()
+            assert running.result() is True
+
+        assert executor.run_stats.num_intervals == 1
+
+    def test_exception(self) -> None:
+        with redirect_stdout(out := StringIO()):
+            with TimedExecutor(ThreadPoolExecutor(1), print_fn=print,
+                               summary_print_fn=None) as executor:
+                future = executor.submit(fail)
+                with pytest.raises(ValueError, match='An error occurred'):
+                    future.result()
+            print_str = out.getvalue().strip()
+
+        assert print_str.startswith('fail: queued ')
+        assert print_str.endswith(' (failed)')
+        assert executor.run_stats.num_intervals == 1
+
+    def test_no_tasks(self) -> None:
+        with redirect_stdout(out := StringIO()):
+            with TimedExecutor(ThreadPoolExecutor(1)):
+                pass
+
+        assert out.getvalue().strip() == 'no tasks'
+
+    def test_process_pool(self) -> None:
+        with TimedExecutor(ProcessPoolExecutor(2), summary_print_fn=None) as executor:
+            assert list(executor.map(square, [1, 2, 3])) == [1, 4, 9]
+
+        assert executor.run_stats.num_intervals == 3
+        assert executor.queue_stats.min >= 0
@@ -0,0 +1,99 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from time import sleep
+
+import pytest
+
+from horology import TimedMap
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def fail_on_three(x: int) -> int:
+    if x == 3:
+        raise ValueError('An error occurred')
+    return x
+
+
+class TestTimedMap:
+
+    def test_ordered_results_and_summary(self) -> None:
+        with redirect_stdout(out := StringIO()):
+            results = list(TimedMap(square, range(5), max_workers=2))
+            lines = out.getvalue().strip().split('\n')
+
+        assert results == [0, 1, 4, 9, 16]
+        assert [line.split(':')[0] for line in lines[:5]] == [f'item {i:4}' for i in range(1, 6)]
+        assert lines[5] == ''
+        assert lines[6].startswith('total 5 items in ')
+        assert lines[7].startswith('min/median/max: ')
+        assert lines[8].startswith('average (std): ')
+        assert lines[9].startswith('throughput: ')
+        assert lines[10].endswith(' of 2 workers')
+
+    def test_as_completed(self) -> None:
+        def wait_for_first(x: int) -> int:
+            if x == 0:
+                sleep(0.1)
+            return x
+
+        tm = TimedMap(wait_for_first, range(4), max_workers=4, ordered=False,
+                      item_print_fn=None, summary_print_fn=None)
+        results = list(tm)
+
+        assert sorted(results) == [0, 1, 2, 3]
+        assert results[-1] == 0
+        assert tm.stats.num_intervals == 4
+
+    def test_bounded_in_flight(self) -> None:
+        consumed = []
+        lock = threading.Lock()
+
+        def items():
+            for i in range(20):
+                with lock:
+                    consumed.append(i)
+                yield i
+
+        tm = TimedMap(square, items(), max_workers=2, max_in_flight=3,
+                      item_print_fn=None, summary_print_fn=None)
+        for i, _ in enumerate(tm):
+            assert len(consumed) <= i + 4
+
+    def test_sample_size(self) -> None:
+        tm = TimedMap(square, range(20), sample_size=5, item_print_fn=None, summary_print_fn=None)
+        list(tm)
+
+        assert tm.stats.num_intervals == 20
+        assert len(tm.stats.intervals) == 5
+
+    def test_exception(self) -> None:
+        tm = TimedMap(fail_on_three, range(5), item_print_fn=None, summary_print_fn=None)
+        with pytest.raises(ValueError, match='An error occurred'):
+            list(tm)
+
+    def test_existing_executor(self) -> None:
+        with ThreadPoolExecutor(2) as executor:
+            tm = TimedMap(square, [1, 2], executor=executor, summary_print_fn=None,
+                          item_print_fn=None)
+            assert list(tm) == [1, 4]
+            assert executor.submit(square, 3).result() == 9
+
+    def test_process_pool(self) -> None:
+        tm = TimedMap(square, range(4), executor='process', max_workers=2,
+                      item_print_fn=None, summary_print_fn=None)
+        assert list(tm) == [0, 1, 4, 9]
+
+    def test_no_items(self) -> None:
+        with redirect_stdout(out := StringIO()):
+            list(TimedMap(square, []))
+
+        assert out.getvalue().strip() == 'no items'
+
+    def test_unknown_executor(self) -> None:
+        with pytest.raises(ValueError):
+            TimedMap(square, [], executor='gpu')  # type: ignore[arg-type]
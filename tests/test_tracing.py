@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from horology import Timed, Timing, TraceRecorder, timed
+from horology import tracing
+
+
+def read_spans(path: Path) -> tuple[list[dict], dict[int, str]]:
+    events = json.loads(path.read_text())
+    spans = [e for e in events if e['ph'] == 'X']
+    tracks = {e['tid']: e['args']['name'] for e in events if e['ph'] == 'M'}
+    return spans, tracks
+
+
+class TestTraceRecorder:
+
+    def test_spans_of_all_tools(self, tmp_path: Path) -> None:
+        path = tmp_path / 'trace.json'
+
+        @timed(print_fn=None)
+        def foo():
+            pass
+
+        with TraceRecorder(path):
+            with Timing('outer: ', print_fn=None):
+                foo()
+                for _ in Timed(range(2), iteration_print_fn=None, summary_print_fn=None):
+                    pass
+
+        assert tracing.recorder is None
+        spans, tracks = read_spans(path)
+        names = [s['name'] for s in spans]
+        assert names == [foo.__qualname__, 'iteration 1', 'iteration 2', 'Timed', 'outer']
+        assert [s['cat'] for s in spans] == ['timed', 'Timed', 'Timed', 'Timed', 'Timing']
+
+        outer = spans[-1]
+        for span in spans[:-1]:
+            assert outer['ts'] <= span['ts']
+            assert span['ts'] + span['dur'] <= outer['ts'] + outer['dur']
+        assert tracks == {1: 'MainThread'}
+
+    def test_chunks(self, tmp_path: Path) -> None:
+        path = tmp_path / 'trace.json'
+
+        with TraceRecorder(path, chunk_size=3) as recorder:
+            for i in range(10):
+                recorder.add(f'span {i}', i, i + 0.5)
+
+        spans, _ = read_spans(path)
+        assert [s['name'] for s in spans] == [f'span {i}' for i in range(10)]
+        assert spans[1]['dur'] == 0.5e6
+
+    def test_threads_and_tasks(self, tmp_path: Path) -> None:
+        path = tmp_path / 'trace.json'
+
+        async def job() -> None:
+            with Timing(print_fn=None):
+                await asyncio.sleep(0)
+
+        async def main() -> None:
+            await asyncio.gather(asyncio.create_task(job(), name='job-1'),
+                                 asyncio.create_task(job(), name='job-2'))
+
+        def work() -> None:
+            with Timing(print_fn=None):
+                pass
+
+        with TraceRecorder(path):
+            asyncio.run(main())
+            thread = threading.Thread(target=work, name='worker')
+            thread.start()
+            thread.join()
+
+        spans, tracks = read_spans(path)
+        assert sorted(tracks.values()) == ['MainThread tasks 1', 'MainThread tasks 2', 'worker']
+        assert len({s['tid'] for s in spans}) == 3
+        assert sorted(s['args']['task'] for s in spans if 'args' in s) == ['job-1', 'job-2']
+
+    def test_tracks_of_done_tasks_are_reused(self, tmp_path: Path) -> None:
+        path = tmp_path / 'trace.json'
+
+        async def job() -> None:
+            with Timing(print_fn=None):
+                await asyncio.sleep(0)
+
+        async def main() -> None:
+            for i in range(5):
+                await asyncio.gather(asyncio.create_task(job(), name=f'job-{i}a'),
+                                     asyncio.create_task(job(), name=f'job-{i}b'))
+
+        with TraceRecorder(path) as recorder:
+            asyncio.run(main())
+            assert len(recorder._tracks) == 0
+
+        spans, tracks = read_spans(path)
+        assert sorted(tracks.values()) == ['MainThread tasks 1', 'MainThread tasks 2']
+        assert len(spans) == 10
+        assert spans[-1]['args']['task'] in ('job-4a', 'job-4b')
+
+    def test_one_recorder_at_a_time(self, tmp_path: Path) -> None:
+        with TraceRecorder(tmp_path / 'a.json'):
+            with pytest.raises(RuntimeError):
+                TraceRecorder(tmp_path / 'b.json').start()
+
+    def test_empty(self, tmp_path: Path) -> None:
+        path = tmp_path / 'trace.json'
+        with TraceRecorder(path):
+            pass
+
+        assert json.loads(path.read_text()) == []
+
+    def test_stop_without_start(self, tmp_path: Path) -> None:
+        recorder = TraceRecorder(tmp_path / 'trace.json')
+        recorder.stop()
+
+        with recorder:
+            pass
+        recorder.stop()
+
+        assert json.loads((tmp_path / 'trace.json').read_text()) == []
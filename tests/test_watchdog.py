@@ -0,0 +1,103 @@
+import threading
+from time import sleep
+
+import pytest
+
+from horology import Timing, timed
+from horology.watchdog import Watchdog
+
+
+@pytest.mark.flaky(reruns=7)
+class TestWatchdog:
+
+    def test_stalled_context_is_reported(self) -> None:
+        reports: list[str] = []
+        reported = threading.Event()
+
+        def print_fn(s: str) -> None:
+            reports.append(s)
+            if 'still running' in s:
+                reported.set()
+
+        with Timing(name='Stalling: ', budget=0.02, watchdog=True, print_fn=print_fn):
+            assert reported.wait(2)
+
+        assert len(reports) == 2
+        assert reports[0].startswith('Stalling: still running after ')
+        assert 'budget 20 ms exceeded' in reports[0]
+        assert 'in test_stalled_context_is_reported' in reports[0]
+        assert reports[1].endswith('(over budget)')
+
+    def test_stall_print_fn(self) -> None:
+        reports: list[str] = []
+        reported = threading.Event()
+
+        def stall_print_fn(s: str) -> None:
+            reports.append(s)
+            reported.set()
+
+        @timed(print_fn=None, budget=0.02, watchdog=True, stall_print_fn=stall_print_fn)
+        def stalling():
+            assert reported.wait(2)
+
+        stalling()
+
+        assert len(reports) == 1
+        assert reports[0].startswith('stalling: still running after ')
+
+    def test_finished_blocks_are_not_reported(self) -> None:
+        reports: list[str] = []
+
+        @timed(budget=0.05, watchdog=True, print_fn=reports.append)
+        def fast():
+            pass
+
+        for _ in range(3):
+            fast()
+        sleep(0.1)
+
+        assert len(reports) == 3
+        assert all('still running' not in r for r in reports)
+
+    def test_report_once(self) -> None:
+        reports: list[str] = []
+        watchdog = Watchdog()
+
+        token = watchdog.watch('slow: ', 0.01, reports.append)
+        sleep(0.1)
+        watchdog.unwatch(token)
+
+        assert len(reports) == 1
+
+    def test_failing_print_fn(self, capsys: pytest.CaptureFixture) -> None:
+        reports: list[str] = []
+        reported = threading.Event()
+        watchdog = Watchdog()
+
+        def fail(s: str) -> None:
+            raise ValueError('An error occurred')
+
+        def print_fn(s: str) -> None:
+            reports.append(s)
+            reported.set()
+
+        first = watchdog.watch('first: ', 0.01, fail)
+        sleep(0.05)
+        second = watchdog.watch('second: ', 0.01, print_fn)
+        assert reported.wait(2)
+        watchdog.unwatch(first)
+        watchdog.unwatch(second)
+
+        assert len(reports) == 1
+        assert reports[0].startswith('second: still running after ')
+        assert 'ValueError: An error occurred' in capsys.readouterr().err
+
+    def test_watchdog_requires_budget(self) -> None:
+        with pytest.raises(ValueError):
+            timed(watchdog=True)
+
+    def test_watchdog_requires_print_fn(self) -> None:
+        with pytest.raises(ValueError):
+            timed(budget=1, watchdog=True, print_fn=None)
+        with pytest.raises(ValueError):
+            Timing(budget=1, watchdog=True, print_fn=None)